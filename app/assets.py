@@ -0,0 +1,140 @@
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+STATIC_PREFIX = "/static"
+
+# Hex digits of the content hash put into fingerprinted file names
+FINGERPRINT_LENGTH = 12
+
+# Media types worth compressing (images and fonts already are)
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+# Response compression of dynamic responses: level, and the smallest body compressed
+GZIP_LEVEL = 6
+GZIP_MINIMUM_SIZE = 500
+
+
+class Asset:
+    """One static file: its content, fingerprint and precompressed variants."""
+
+    def __init__(self, name: str, content: bytes):
+        self.name = name
+        self.digest = hashlib.sha256(content).hexdigest()[:FINGERPRINT_LENGTH]
+        self.media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+        stem, dot, suffix = name.rpartition(".")
+        self.fingerprinted_name = f"{stem}.{self.digest}.{suffix}" if dot else f"{name}.{self.digest}"
+
+        # Encoding -> body, best compression first
+        self.variants: dict[str, bytes] = {}
+        if self.media_type.startswith(COMPRESSIBLE_TYPES):
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(content, quality=11)
+            self.variants["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+        self.variants["identity"] = content
+
+    def negotiate(self, accept_encoding: str) -> tuple[str, bytes]:
+        """
+        Pick the smallest variant the client accepts.
+
+        :param accept_encoding: The request's Accept-Encoding header
+        :type accept_encoding: str
+        :return: (content encoding, body)
+        :rtype: tuple[str, bytes]
+        """
+        accepted = set()
+        for part in accept_encoding.lower().split(","):
+            coding, _, params = part.partition(";")
+            params = params.strip()
+            try:
+                quality = float(params[2:]) if params.startswith("q=") else 1.0
+            except ValueError:
+                quality = 0.0
+            if quality > 0:
+                accepted.add(coding.strip())
+
+        for encoding, body in self.variants.items():
+            if encoding in accepted or "*" in accepted or encoding == "identity":
+                return encoding, body
+
+
+class StaticAssets:
+    """
+    The files of a static directory, loaded and compressed once at startup
+    and addressed by content-hashed names (style.css -> style.<hash>.css),
+    so browsers can cache them forever and a changed file gets a new URL.
+    """
+
+    def __init__(self, directory: Path = STATIC_DIR):
+        self.directory = Path(directory)
+        self._by_name: dict[str, Asset] = {}
+        self._by_fingerprint: dict[str, Asset] = {}
+        self.build()
+
+    def build(self):
+        """(Re)load every file of the directory."""
+        by_name, by_fingerprint = {}, {}
+
+        for path in sorted(self.directory.rglob("*")):
+            if path.is_file():
+                name = path.relative_to(self.directory).as_posix()
+                asset = Asset(name, path.read_bytes())
+                by_name[name] = asset
+                by_fingerprint[asset.fingerprinted_name] = asset
+
+        self._by_name, self._by_fingerprint = by_name, by_fingerprint
+
+    def url(self, name: str) -> str:
+        """
+        Returns the fingerprinted URL of a static file, for templates.
+
+        :param name: File name relative to the static directory
+        :type name: str
+        :return: URL such as /static/style.0123456789ab.css
+        :rtype: str
+        """
+        asset = self._by_name.get(name)
+        return f"{STATIC_PREFIX}/{asset.fingerprinted_name if asset else name}"
+
+    def lookup(self, name: str) -> tuple[Asset | None, bool]:
+        """
+        Find a file by fingerprinted or plain name.
+
+        :return: (asset or None, whether the name was fingerprinted)
+        :rtype: tuple[Asset | None, bool]
+        """
+        if name in self._by_fingerprint:
+            return self._by_fingerprint[name], True
+        return self._by_name.get(name), False
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware for the rendered pages and JSON, skipping the paths that
+    compress on their own (precompressed static files, gzip exports).
+    """
+
+    def __init__(self, app: ASGIApp, exclude: tuple[str, ...] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exclude = exclude
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"].startswith(self.exclude):
+            await self.app(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
+
+
+assets = StaticAssets()
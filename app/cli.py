@@ -61,53 +61,357 @@
 #         print("Available commands: run")
 
 
+import argparse
 import os
 import sys
-import webbrowser
-import time
+from datetime import date
 
-from app.database.db import SessionLocal
-from app.database.init_db import init_db
-from app.services.daily_generator import ensure_day_exists
+# Only the standard library is imported up front: the quick commands
+# (status, list, done) read SQLite directly and must start fast. Every
+# other command imports the app lazily.
 
 
-def run_app():
-    # 1. Ensure DB schema exists
-    init_db()
+def run_app(host: str = "127.0.0.1", port: int = 8000, workers: int = 1, browser: bool = True):
+    """
+    Entry point for `todo run [--host] [--port] [--workers]`.
+    Workers are separate uvicorn processes sharing the databases; day
+    generation is serialized by SQLite's write lock and the caches follow
+    the shared data version. Requests pick their profile themselves.
+    """
+    import time
+    import webbrowser
+    from app.database.shards import for_each_profile
+    from app.services.daily_generator import catch_up_missed_days
 
-    # 2. Ensure daily state exists
-    db = SessionLocal()
-    try:
-        ensure_day_exists(db)
-    finally:
-        db.close()
+    # 1-2. Ensure every profile's schema and daily state exist (backfilling
+    # any missed days), profiles in parallel
+    for_each_profile(catch_up_missed_days)
 
-    print("Starting Daily Todo server...")
+    print(f"Starting Daily Todo server on {host}:{port} ({workers} worker(s))...")
 
     # 3. Open browser AFTER short delay
     def open_browser():
         time.sleep(1.5)
         try:
-            webbrowser.open("http://localhost:8000")
+            browser_host = "localhost" if host in {"0.0.0.0", "::"} else host
+            webbrowser.open(f"http://{browser_host}:{port}")
         except Exception:
             pass
 
-    import threading
-    threading.Thread(target=open_browser, daemon=True).start()
+    if browser:
+        import threading
+        threading.Thread(target=open_browser, daemon=True).start()
 
     # 4. REPLACE current process with uvicorn (BLOCKING)
     os.execvp(
         "uvicorn",
-        ["uvicorn", "app.main:app"]
+        [
+            "uvicorn", "app.main:app",
+            "--host", host,
+            "--port", str(port),
+            "--workers", str(workers),
+        ]
     )
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: todo run")
+def verify_summaries(dry_run: bool = False, profile: str | None = None):
+    """
+    Entry point for `todo verify-summaries [--dry-run]`.
+    Detects day summaries that drifted from the true task counts and
+    repairs them unless --dry-run is given.
+    """
+    from app.services.summary_service import verify_day_summaries
+
+    db = _session(profile)
+    try:
+        drift = verify_day_summaries(db, repair=not dry_run)
+    finally:
+        db.close()
+
+    for item in drift:
+        print(
+            f"{item['date']}: total {item['actual_total']} -> {item['expected_total']}, "
+            f"completed {item['actual_completed']} -> {item['expected_completed']}"
+        )
+
+    if not drift:
+        print("All day summaries match the task counts.")
+    elif dry_run:
+        print(f"{len(drift)} day(s) drifted. Run without --dry-run to repair.")
+        sys.exit(1)
+    else:
+        print(f"Repaired {len(drift)} day(s).")
+
+
+def export_table(table: str, fmt: str, start=None, end=None, output=None, gzip=False,
+                 profile: str | None = None):
+    """
+    Entry point for `todo export`.
+    Streams a table to a file (or stdout) in constant memory.
+    """
+    from app.services.export_service import iter_export, gzip_chunks, EXPORT_TABLES
+
+    if table not in EXPORT_TABLES:
+        print(f"Unknown table: {table} (choose from {', '.join(EXPORT_TABLES)})")
+        sys.exit(2)
+
+    db = _session(profile)
+    try:
+        chunks = iter_export(db, table, fmt, start, end)
+
+        if gzip:
+            chunks = gzip_chunks(chunks)
+
+        if output is None:
+            stream = sys.stdout.buffer if gzip else sys.stdout
+            for chunk in chunks:
+                stream.write(chunk)
+            stream.flush()
+        else:
+            mode = "wb" if gzip else "w"
+            encoding = None if gzip else "utf-8"
+            with open(output, mode, encoding=encoding, newline=None if gzip else "") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+    finally:
+        db.close()
+
+
+def import_file(path: str, profile: str | None = None):
+    """
+    Entry point for `todo import FILE`.
+    Bulk-loads history exported from here or another tracker.
+    """
+    from app.services.import_service import import_history, read_records
+
+    def report(records: int, inserted: int):
+        print(f"\r{records} records read, {inserted} inserted", end="", file=sys.stderr, flush=True)
+
+    db = _session(profile)
+    try:
+        stats = import_history(db, read_records(path), progress=report)
+    except (OSError, ValueError) as e:
+        print(f"\nImport failed, nothing was written: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(file=sys.stderr)
+    print(
+        f"Imported {stats['inserted']} of {stats['records']} records "
+        f"({stats['templates']} new task(s), {stats['skipped']} future record(s) skipped)."
+    )
+    if stats["inserted"]:
+        print(f"Rebuilt summaries for {stats['start']} .. {stats['end']}.")
+
+
+def archive(keep_months: int | None = None, vacuum: bool = True, profile: str | None = None):
+    """
+    Entry point for `todo archive [--keep-months N] [--no-vacuum]`.
+    Packs closed months of daily tasks into task_archive and, unless
+    --no-vacuum is given, compacts the database file afterwards.
+    """
+    from sqlalchemy import text
+    from app.config import settings
+    from app.services.archive import archive_cutoff, archive_months, DEFAULT_KEEP_MONTHS
+    from app.services.cache import bump_data_version
+    from app.services.daily_generator import catch_up_missed_days
+
+    if keep_months is None:
+        keep_months = settings.archive_keep_months or DEFAULT_KEEP_MONTHS
+
+    db = _session(profile)
+    try:
+        catch_up_missed_days(db)
+
+        cutoff = archive_cutoff(db, keep_months)
+        archived = archive_months(db, cutoff) if cutoff else 0
+        db.commit()
+
+        if archived:
+            bump_data_version(db)
+            if vacuum:
+                db.execute(text("VACUUM"))
+                # In WAL mode the file only shrinks once the WAL is checkpointed
+                db.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    finally:
+        db.close()
+
+    if archived:
+        print(f"Archived {archived} task rows through {cutoff}.")
+    else:
+        print("Nothing to archive.")
+
+
+def _session(profile: str | None = None):
+    """Open a session on a profile's database, creating it on first use."""
+    from app.config import DEFAULT_PROFILE
+    from app.database.shards import shards
+
+    return shards.get(profile or DEFAULT_PROFILE, create=True).SessionLocal()
+
+
+def _today_fast(query, *args, profile: str | None = None):
+    """
+    Run a fastpath query for the logical today. Only when today's tasks do
+    not exist yet (first use of the day, or no database) are the app and
+    ORM imported to open the day, after which the query is retried.
+    """
+    from app import fastpath
+    from app.config import settings, DEFAULT_PROFILE
+    from app.services.date_service import get_logical_date
+
+    today = get_logical_date()
+    db_path = settings.profile_db_path(profile or DEFAULT_PROFILE)
+    conn = fastpath.connect(db_path, settings.busy_timeout)
+
+    try:
+        result = query(conn, today, *args) if conn else None
+
+        if result is None:
+            from app.services.daily_generator import catch_up_missed_days
+
+            db = _session(profile)
+            try:
+                catch_up_missed_days(db, today)
+            finally:
+                db.close()
+
+            conn = conn or fastpath.connect(db_path, settings.busy_timeout)
+            result = query(conn, today, *args)
+    finally:
+        if conn:
+            conn.close()
+
+    return result
+
+
+def status(profile: str | None = None):
+    """
+    Entry point for `todo status`: today's progress on one line.
+    """
+    from app.fastpath import today_progress
+
+    progress = _today_fast(today_progress, profile=profile)
+
+    print(
+        f"{progress['completed']}/{progress['total']} done "
+        f"({progress['percent']:.0f}%), streak {progress['streak']}"
+    )
+
+
+def list_tasks(profile: str | None = None):
+    """
+    Entry point for `todo list`: today's tasks with their state.
+    """
+    from app.fastpath import today_tasks
+
+    tasks = _today_fast(today_tasks, profile=profile)
+
+    for name, completed in tasks:
+        print(f"[{'x' if completed else ' '}] {name}")
+
+    if not tasks:
+        print("No tasks today.")
+
+
+def done(name: str, profile: str | None = None):
+    """
+    Entry point for `todo done NAME`: mark one of today's tasks as done.
+    NAME can be any unambiguous start of the task name.
+    """
+    from app.fastpath import complete_by_name, today_progress
+
+    try:
+        task_name, changed = _today_fast(complete_by_name, name, profile=profile)
+    except LookupError as e:
+        print(e.args[0])
         sys.exit(1)
 
-    if sys.argv[1] == "run":
-        run_app()
+    progress = _today_fast(today_progress, profile=profile)
+    state = "Done" if changed else "Already done"
+
+    print(
+        f"{state}: {task_name} "
+        f"({progress['completed']}/{progress['total']}, {progress['percent']:.0f}%)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="todo", description="Daily Todo")
+    parser.add_argument(
+        "-p", "--profile", default=os.environ.get("DAILY_TODO_PROFILE"),
+        help="Profile (database) to use (default: $DAILY_TODO_PROFILE or the default one)",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    run = commands.add_parser("run", help="Start the web app")
+    run.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    run.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    run.add_argument(
+        "--workers", type=int, default=1,
+        help="Server processes (default: 1; e.g. the number of CPU cores)",
+    )
+    run.add_argument("--no-browser", action="store_true", help="Do not open a browser")
+    commands.add_parser("status", help="Show today's progress")
+    commands.add_parser("list", help="List today's tasks")
+
+    done_ = commands.add_parser("done", help="Mark one of today's tasks as done")
+    done_.add_argument("name", nargs="+", help="Task name (or an unambiguous start of it)")
+
+    verify = commands.add_parser(
+        "verify-summaries", help="Check (and repair) the day summaries"
+    )
+    verify.add_argument("--dry-run", action="store_true", help="Only report drift")
+
+    export = commands.add_parser("export", help="Export history as CSV or NDJSON")
+    export.add_argument("table", help="daily_tasks or day_summary")
+    export.add_argument("--format", dest="fmt", choices=("csv", "ndjson"), default="csv")
+    export.add_argument("--from", dest="start", type=date.fromisoformat, help="YYYY-MM-DD")
+    export.add_argument("--to", dest="end", type=date.fromisoformat, help="YYYY-MM-DD")
+    export.add_argument("-o", "--output", help="Output file (default: stdout)")
+    export.add_argument("--gzip", action="store_true", help="Gzip the output file")
+
+    import_ = commands.add_parser("import", help="Import history from CSV or NDJSON")
+    import_.add_argument("file", help=".csv, .ndjson or .jsonl, optionally .gz")
+
+    archive_ = commands.add_parser("archive", help="Pack old months into the archive")
+    archive_.add_argument(
+        "--keep-months", type=int,
+        help="Full months to keep live besides the current one (default: 3)",
+    )
+    archive_.add_argument("--no-vacuum", action="store_true", help="Skip compacting the file")
+
+    args = parser.parse_args()
+    profile = args.profile
+
+    if profile is not None:
+        from app.config import settings
+
+        try:
+            settings.profile_db_path(profile)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.command == "run":
+        if args.workers < 1:
+            parser.error("--workers must be at least 1")
+        run_app(args.host, args.port, args.workers, browser=not args.no_browser)
+    elif args.command == "status":
+        status(profile)
+    elif args.command == "list":
+        list_tasks(profile)
+    elif args.command == "done":
+        done(" ".join(args.name), profile)
+    elif args.command == "verify-summaries":
+        verify_summaries(dry_run=args.dry_run, profile=profile)
+    elif args.command == "export":
+        export_table(
+            args.table, args.fmt, args.start, args.end, args.output, args.gzip, profile
+        )
+    elif args.command == "import":
+        import_file(args.file, profile)
+    elif args.command == "archive":
+        archive(args.keep_months, vacuum=not args.no_vacuum, profile=profile)
     else:
-        print(f"Unknown command: {sys.argv[1]}")
-        print("Available commands: run")
\ No newline at end of file
+        parser.print_help()
+        sys.exit(1)
@@ -0,0 +1,150 @@
+import os
+import re
+from configparser import ConfigParser
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+
+# Project root (the directory containing the `app` package)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Settings file and environment variable conventions
+CONFIG_ENV_VAR = "DAILY_TODO_CONFIG"
+DEFAULT_CONFIG_FILE = Path.home() / ".config" / "daily-todo" / "config.ini"
+CONFIG_SECTION = "daily-todo"
+ENV_PREFIX = "DAILY_TODO_"
+
+# Profiles: each one is a separate SQLite file; the default one is db_path
+DEFAULT_PROFILE = "default"
+PROFILE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Runtime settings, read from a config file and environment variables."""
+
+    # --- Database file ---
+    db_path: Path = PROJECT_ROOT / "daily_todo.db"
+
+    # --- Profiles (one SQLite file per profile) ---
+    profiles_dir: Path = PROJECT_ROOT / "profiles"
+    max_open_profiles: int = 16  # databases kept open at once (LRU)
+    profile_workers: int = 4  # threads opening the day across profiles
+
+    # --- SQLite connection profile (applied on every new connection) ---
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024  # bytes
+    cache_size: int = -64 * 1024  # negative = KiB, positive = pages
+    busy_timeout: int = 5000  # milliseconds
+
+    # --- Connection pool ---
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0  # seconds
+    pool_recycle: int = -1  # seconds, -1 = never
+
+    # --- Background rollover at DAY_RESET_HOUR ---
+    scheduler_enabled: bool = True
+
+    # --- Archival ---
+    archive_keep_months: int = 0  # full months kept in daily_tasks, 0 = no automatic archival
+
+    # --- Instrumentation ---
+    slow_request_ms: float = 500.0  # log requests slower than this, 0 = off
+    slow_request_queries: int = 3  # statements listed per slow request
+
+    def profile_db_path(self, profile: str) -> Path:
+        """
+        Returns the database file of a profile: db_path for the default
+        profile, profiles_dir/<profile>.db for the others.
+
+        :param profile: Profile name
+        :type profile: str
+        :return: Path of the profile's SQLite file
+        :rtype: Path
+        :raises ValueError: The name is not a valid profile name
+        """
+        if profile == DEFAULT_PROFILE:
+            return self.db_path
+
+        if not PROFILE_NAME.match(profile):
+            raise ValueError(f"Invalid profile name: {profile!r}")
+
+        return self.profiles_dir / f"{profile}.db"
+
+
+def load_settings(environ: dict | None = None) -> Settings:
+    """
+    Build the settings from defaults, the config file and the environment.
+
+    The config file is an INI file with a [daily-todo] section whose keys
+    are the Settings field names. Its path comes from DAILY_TODO_CONFIG,
+    falling back to ~/.config/daily-todo/config.ini when present.
+    Environment variables (DAILY_TODO_<FIELD>) override the file.
+
+    :param environ: Environment mapping (defaults to os.environ)
+    :type environ: dict | None
+    :return: The resolved settings
+    :rtype: Settings
+    """
+    if environ is None:
+        environ = os.environ
+
+    values = {}
+
+    config_file = environ.get(CONFIG_ENV_VAR)
+    if config_file or DEFAULT_CONFIG_FILE.exists():
+        parser = ConfigParser()
+        parser.read(Path(config_file or DEFAULT_CONFIG_FILE).expanduser())
+        if parser.has_section(CONFIG_SECTION):
+            values.update(parser.items(CONFIG_SECTION))
+
+    for field in fields(Settings):
+        env_value = environ.get(ENV_PREFIX + field.name.upper())
+        if env_value is not None:
+            values[field.name] = env_value
+
+    settings = Settings()
+    for field in fields(Settings):
+        if field.name in values:
+            settings = replace(
+                settings, **{field.name: _coerce(field.name, values[field.name])}
+            )
+
+    _validate(settings)
+    return settings
+
+
+def _coerce(name: str, raw: str):
+    """Convert a raw string setting to the type of its default."""
+    default = getattr(Settings, name)
+
+    if isinstance(default, Path):
+        return Path(raw).expanduser().resolve()
+    if isinstance(default, bool):
+        return raw.strip().lower() in {"1", "true", "yes", "on"}
+    if isinstance(default, int):
+        return int(raw)
+    if isinstance(default, float):
+        return float(raw)
+    if name in {"journal_mode", "synchronous"}:
+        return raw.strip().upper()
+    return raw.strip()
+
+
+def _validate(settings: Settings):
+    """Reject values that would be interpolated into PRAGMA statements."""
+    if settings.journal_mode not in JOURNAL_MODES:
+        raise ValueError(f"Invalid journal_mode: {settings.journal_mode}")
+
+    if settings.synchronous not in SYNCHRONOUS_LEVELS:
+        raise ValueError(f"Invalid synchronous level: {settings.synchronous}")
+
+    if settings.max_open_profiles < 1:
+        raise ValueError("max_open_profiles must be at least 1")
+
+
+settings = load_settings()
@@ -1,12 +1,162 @@
+import threading
+from pathlib import Path
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./daily_todo.db"
+from app.config import settings, Settings
+from app.metrics import instrument_engine
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+
+def sqlite_url(db_path: Path, driver: str = "sqlite") -> str:
+    """Build an absolute SQLite URL, independent of the working directory."""
+    return f"{driver}:///{Path(db_path).resolve()}"
+
+
+def create_sqlite_engine(db_path: Path, config: Settings = settings) -> Engine:
+    """
+    Create an engine for a SQLite file using the configured connection
+    profile (pragmas and pool settings).
+
+    :param db_path: Path of the SQLite database file
+    :type db_path: Path
+    :param config: Settings providing the connection profile
+    :type config: Settings
+    :return: The configured engine
+    :rtype: Engine
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+    sqlite_engine = create_engine(
+        sqlite_url(db_path),
+        connect_args={
+            "check_same_thread": False,
+            "timeout": config.busy_timeout / 1000,
+        },
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout,
+        pool_recycle=config.pool_recycle,
+    )
+
+    event.listen(sqlite_engine, "connect", sqlite_pragma_listener(config))
+    instrument_engine(sqlite_engine)
+    return sqlite_engine
+
+
+def create_async_sqlite_engine(db_path: Path, config: Settings = settings) -> AsyncEngine:
+    """
+    Create an aiosqlite engine for a SQLite file with the same connection
+    profile as create_sqlite_engine().
+
+    :param db_path: Path of the SQLite database file
+    :type db_path: Path
+    :param config: Settings providing the connection profile
+    :type config: Settings
+    :return: The configured async engine
+    :rtype: AsyncEngine
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+    sqlite_engine = create_async_engine(
+        sqlite_url(db_path, driver="sqlite+aiosqlite"),
+        connect_args={
+            "check_same_thread": False,
+            "timeout": config.busy_timeout / 1000,
+        },
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout,
+        pool_recycle=config.pool_recycle,
+    )
+
+    event.listen(sqlite_engine.sync_engine, "connect", sqlite_pragma_listener(config))
+    instrument_engine(sqlite_engine.sync_engine)
+    return sqlite_engine
+
+
+# Sync engines of the async engines' databases (by URL), for work that
+# must run on a thread rather than in the async session's greenlet
+_sync_engines: dict[str, Engine] = {}
+_sync_engines_lock = threading.Lock()
+
+
+def register_sync_engine(async_engine: AsyncEngine, sync_engine: Engine):
+    """Declare `sync_engine` as the sync counterpart of `async_engine`."""
+    with _sync_engines_lock:
+        _sync_engines[async_engine.url.database] = sync_engine
+
+
+def sync_engine_for(async_engine: AsyncEngine, config: Settings = settings) -> Engine:
+    """
+    Returns a pysqlite engine on the same database file as an aiosqlite
+    engine (the registered one, else a new one that is kept). The async
+    engine's own sync_engine cannot be used outside its greenlet.
+
+    :param async_engine: The aiosqlite engine
+    :type async_engine: AsyncEngine
+    :param config: Settings providing the connection profile
+    :type config: Settings
+    :return: The sync engine
+    :rtype: Engine
+    """
+    database = async_engine.url.database
+
+    with _sync_engines_lock:
+        sync_engine = _sync_engines.get(database)
+        if sync_engine is None:
+            sync_engine = _sync_engines[database] = create_sqlite_engine(Path(database), config)
+
+    return sync_engine
+
+
+def sqlite_pragma_listener(config: Settings = settings):
+    """
+    Build a "connect" event listener applying the SQLite pragmas.
+
+    WAL lets readers proceed while a completion is being written, and
+    busy_timeout makes writers wait for the lock instead of failing.
+    """
+    pragmas = (
+        "PRAGMA foreign_keys=ON",
+        f"PRAGMA journal_mode={config.journal_mode}",
+        f"PRAGMA synchronous={config.synchronous}",
+        f"PRAGMA busy_timeout={int(config.busy_timeout)}",
+        f"PRAGMA cache_size={int(config.cache_size)}",
+        f"PRAGMA mmap_size={int(config.mmap_size)}",
+    )
+
+    def configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+        """Apply the connection profile to a new SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return configure_sqlite_connection
+
+
+def begin_immediate(db: Session):
+    """
+    Start the session's transaction with BEGIN IMMEDIATE, taking SQLite's
+    write lock up front. Use it for read-then-write transactions that
+    several processes may run at once: a deferred transaction that reads
+    first cannot upgrade to a writer once another process has committed,
+    while an immediate one simply waits (busy_timeout) for its turn and
+    then sees the other process's rows. No-op inside a transaction.
+
+    :param db: Database session (sync, or the sync side of an async session)
+    :type db: Session
+    """
+    connection = db.connection()
+    if not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+DATABASE_URL = sqlite_url(settings.db_path)
+
+engine = create_sqlite_engine(settings.db_path)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -14,13 +164,15 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
-Base = declarative_base()
+async_engine = create_async_sqlite_engine(settings.db_path)
+register_sync_engine(async_engine, engine)
 
+# Objects stay usable after commit: expired attributes cannot be
+# lazily refreshed outside of the async session's greenlet.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
 
-# Enable SQLite foreign key enforcement
-@event.listens_for(engine, "connect")
-def enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
-    """Enable foreign key enforcement for SQLite."""
-    cursor = dbapi_connection.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
+Base = declarative_base()
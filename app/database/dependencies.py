@@ -1,9 +1,55 @@
-from app.database.db import SessionLocal
+from fastapi import HTTPException, Request
 
-def get_db():
-    """Dependency that provides a database session."""
-    db = SessionLocal()
+from app.config import DEFAULT_PROFILE
+from app.database.shards import shards, Shard
+
+# Where a request names its profile, in order of precedence
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY = "profile"
+PROFILE_COOKIE = "profile"
+
+
+def resolve_profile(request: Request) -> str:
+    """The profile named by the request's header, query or cookie (or the default)."""
+    return (
+        request.headers.get(PROFILE_HEADER)
+        or request.query_params.get(PROFILE_QUERY)
+        or request.cookies.get(PROFILE_COOKIE)
+        or DEFAULT_PROFILE
+    )
+
+
+def get_shard(request: Request) -> Shard:
+    """Dependency that provides the shard of the request's profile."""
+    try:
+        return shards.get(resolve_profile(request))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+async def get_async_shard(request: Request) -> Shard:
+    """Async version of get_shard; opening a database does not block the event loop."""
+    try:
+        return await shards.get_async(resolve_profile(request))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def get_db(request: Request):
+    """Dependency that provides a database session of the request's profile."""
+    db = get_shard(request).SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    """Dependency that provides an async database session of the request's profile."""
+    shard = await get_async_shard(request)
+    async with shard.AsyncSessionLocal() as db:
+        yield db
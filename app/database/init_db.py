@@ -1,6 +1,11 @@
-from app.database.db import engine, Base
-from app.database import models  # noqa: F401
+from sqlalchemy.engine import Engine
 
-def init_db():
-    """Initialize the database by creating all tables."""
-    Base.metadata.create_all(bind=engine)
+from app.database.db import engine as default_engine
+from app.database.migrations import migrate
+
+def init_db(engine: Engine | None = None):
+    """
+    Initialize a database (default: the default profile's): create the
+    tables or apply pending migrations. A no-op when already current.
+    """
+    migrate(engine or default_engine)
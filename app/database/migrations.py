@@ -0,0 +1,118 @@
+"""
+Versioned schema migrations.
+
+The schema version is SQLite's `PRAGMA user_version`: a database at
+version N has run the first N migrations. Startup reads the pragma and
+does nothing else when the database is current. Otherwise the missing
+migrations run in order, in one transaction that holds the write lock,
+so concurrent processes migrate a database exactly once.
+
+To change the schema, update the models and append a migration bringing
+existing databases to the same state. A new database gets the current
+models from the baseline and then runs the later migrations too, so they
+must be idempotent (IF NOT EXISTS, or check before altering). Never edit
+or reorder migrations that have shipped.
+"""
+import logging
+from typing import Callable
+from sqlalchemy.engine import Connection, Engine
+
+from app.database.db import Base
+from app.database import models  # noqa: F401
+
+logger = logging.getLogger("app.migrations")
+
+
+def _baseline(connection: Connection):
+    """Every table of the models that does not exist yet."""
+    Base.metadata.create_all(bind=connection)
+
+
+def _completion_indexes(connection: Connection):
+    """
+    Composite indexes covering the completion counts, so they are read from
+    the index alone: (task_date, completed) for the per-day summaries,
+    (task_id, task_date, completed) for the per-task consistency and
+    streak queries. They make the single-column task_date/task_id indexes
+    redundant (same leading column).
+    """
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS idx_task_date_completed "
+        "ON daily_tasks (task_date, completed)"
+    )
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS idx_task_day_completed "
+        "ON daily_tasks (task_id, task_date, completed)"
+    )
+    connection.exec_driver_sql("DROP INDEX IF EXISTS idx_task_date")
+    connection.exec_driver_sql("DROP INDEX IF EXISTS idx_task_id")
+    connection.exec_driver_sql("ANALYZE daily_tasks")
+
+
+def _template_recurrence(connection: Connection):
+    """Recurrence rule columns on task_templates (NULL = every day)."""
+    existing = {
+        row[1] for row in connection.exec_driver_sql("PRAGMA table_info(task_templates)")
+    }
+
+    for column, column_type in (
+        ("weekday_mask", "INTEGER"),
+        ("interval_days", "INTEGER"),
+        ("anchor_date", "DATE"),
+        ("month_day", "INTEGER"),
+    ):
+        if column not in existing:
+            connection.exec_driver_sql(
+                f"ALTER TABLE task_templates ADD COLUMN {column} {column_type}"
+            )
+
+
+# Applied in order; the position (1-based) is the schema version
+MIGRATIONS: list[Callable[[Connection], None]] = [
+    _baseline,
+    _completion_indexes,
+    _template_recurrence,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(connection: Connection) -> int:
+    """Returns the database's PRAGMA user_version."""
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Bring a database up to SCHEMA_VERSION.
+
+    :param engine: Engine of the database
+    :type engine: Engine
+    :return: The number of migrations applied (0 when already current)
+    :rtype: int
+    """
+    with engine.connect() as connection:
+        version = get_schema_version(connection)
+        if version >= SCHEMA_VERSION:
+            if version > SCHEMA_VERSION:
+                logger.warning(
+                    "database schema version %d is newer than this code (%d)",
+                    version, SCHEMA_VERSION
+                )
+            return 0
+
+        # Take the write lock, then re-read: another process may have
+        # migrated while this one waited
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        version = get_schema_version(connection)
+
+        for number in range(version + 1, SCHEMA_VERSION + 1):
+            logger.info("applying migration %d: %s", number, MIGRATIONS[number - 1].__name__)
+            MIGRATIONS[number - 1](connection)
+
+        # user_version is part of the database header, so it commits
+        # atomically with the migrations
+        connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.commit()
+
+    return max(SCHEMA_VERSION - version, 0)
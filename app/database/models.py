@@ -7,6 +7,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     Float,
+    Text,
     ForeignKey,
     UniqueConstraint,
     Index
@@ -23,6 +24,13 @@ class TaskTemplate(Base):
     is_active = Column(Boolean, nullable=False, default=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
+    # Recurrence rule (see services/recurrence.py); all NULL = every day.
+    # Every rule that is set must match for the task to be due.
+    weekday_mask = Column(Integer, nullable=True)  # bit 0 = Monday ... bit 6 = Sunday
+    interval_days = Column(Integer, nullable=True)  # every N days counted from anchor_date
+    anchor_date = Column(Date, nullable=True)
+    month_day = Column(Integer, nullable=True)  # 1-31, clamped to the month's last day
+
 
 class DailyTask(Base):
     """SQLAlchemy model for daily tasks."""
@@ -37,8 +45,9 @@ class DailyTask(Base):
 
     __table_args__ = (
         UniqueConstraint("task_id", "task_date", name="uq_task_day"),
-        Index("idx_task_date", "task_date"),
-        Index("idx_task_id", "task_id"),
+        # Covering indexes for the completion counts (see migrations)
+        Index("idx_task_date_completed", "task_date", "completed"),
+        Index("idx_task_day_completed", "task_id", "task_date", "completed"),
     )
 
 
@@ -52,3 +61,88 @@ class DaySummary(Base):
     completion_pct = Column(Float, nullable=False)
 
 
+class StreakState(Base):
+    """SQLAlchemy model for the persisted streak projection (single row)."""
+    __tablename__ = "streak_state"
+
+    id = Column(Integer, primary_key=True)
+    current_start = Column(Date, nullable=True)
+    current_end = Column(Date, nullable=True)
+    current_length = Column(Integer, nullable=False, default=0)
+    best_length = Column(Integer, nullable=False, default=0)
+
+
+class RollupState(Base):
+    """SQLAlchemy model tracking the last day folded into the rollups (single row)."""
+    __tablename__ = "rollup_state"
+
+    id = Column(Integer, primary_key=True)
+    closed_through = Column(Date, nullable=True)
+
+
+class SummaryRollup(Base):
+    """SQLAlchemy model for weekly/monthly rollups of closed days."""
+    __tablename__ = "summary_rollups"
+
+    granularity = Column(String, primary_key=True)  # "week" or "month"
+    period_start = Column(Date, primary_key=True)
+    days = Column(Integer, nullable=False, default=0)
+    perfect_days = Column(Integer, nullable=False, default=0)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+
+
+class TaskRollup(Base):
+    """SQLAlchemy model for weekly/monthly per-template rollups of closed days."""
+    __tablename__ = "task_rollups"
+
+    granularity = Column(String, primary_key=True)  # "week" or "month"
+    period_start = Column(Date, primary_key=True)
+    task_id = Column(Integer, ForeignKey("task_templates.id"), primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+
+
+class TaskArchive(Base):
+    """
+    SQLAlchemy model for archived daily tasks: one row per template per
+    month. Bit (day - 1) of `scheduled` is set when the task existed that
+    day and the same bit of `completed` when it was done.
+    """
+    __tablename__ = "task_archive"
+
+    month_start = Column(Date, primary_key=True)
+    task_id = Column(Integer, ForeignKey("task_templates.id"), primary_key=True)
+    scheduled = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+
+    # Completed-occurrence runs within the month, used to join streaks
+    # across months without unpacking the bits
+    lead_run = Column(Integer, nullable=False, default=0)
+    tail_run = Column(Integer, nullable=False, default=0)
+    best_run = Column(Integer, nullable=False, default=0)
+
+    # JSON list of ISO completion timestamps (or null), one per completed day in order
+    completed_at = Column(Text, nullable=False, default="[]")
+
+
+class ArchiveState(Base):
+    """SQLAlchemy model tracking the last day moved into task_archive (single row)."""
+    __tablename__ = "archive_state"
+
+    id = Column(Integer, primary_key=True)
+    archived_through = Column(Date, nullable=True)
+
+
+class DataVersion(Base):
+    """
+    SQLAlchemy model holding the shared data version (single row). Every
+    committed write bumps it, so each server process can tell when its
+    in-memory caches went stale.
+    """
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings, Settings, DEFAULT_PROFILE, PROFILE_NAME
+from app.database import db as default_db
+from app.database.db import create_sqlite_engine, create_async_sqlite_engine, register_sync_engine
+from app.database.init_db import init_db
+from app.services.cache import VersionedCache, dashboard_cache, read_data_version
+
+logger = logging.getLogger("app.shards")
+
+# Async engine disposals in flight; the event loop only keeps weak
+# references to tasks, so they are held here until done
+_disposals: set[asyncio.Task] = set()
+
+
+class Shard:
+    """
+    One profile's database: its engines, session factories and read cache.
+    Sessions carry the profile and cache in Session.info, so services find
+    them from the session they are given.
+    """
+
+    def __init__(self, profile: str, db_path: Path, config: Settings = settings):
+        self.profile = profile
+        self.db_path = db_path
+
+        if profile == DEFAULT_PROFILE:
+            # The default profile is the process-wide database of db.py
+            self.engine = default_db.engine
+            self.async_engine = default_db.async_engine
+            self.cache = dashboard_cache
+        else:
+            self.engine = create_sqlite_engine(db_path, config)
+            self.async_engine = create_async_sqlite_engine(db_path, config)
+            register_sync_engine(self.async_engine, self.engine)
+            self.cache = VersionedCache(version_source=lambda: read_data_version(self.engine))
+
+        info = {"profile": profile, "cache": self.cache}
+
+        self.SessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=self.engine,
+            info=info
+        )
+
+        self.AsyncSessionLocal = async_sessionmaker(
+            bind=self.async_engine,
+            autoflush=False,
+            expire_on_commit=False,
+            info=info
+        )
+
+    def dispose(self):
+        """
+        Close the pooled connections. Sessions still in use keep theirs
+        until they finish.
+        """
+        self.engine.dispose()
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to close aiosqlite connections on: drop the pool
+            self.async_engine.sync_engine.dispose(close=False)
+        else:
+            task = loop.create_task(self.async_engine.dispose())
+            _disposals.add(task)
+            task.add_done_callback(_disposals.discard)
+
+
+class ShardPool:
+    """
+    Open profile databases, at most `max_open` besides the default one,
+    evicting the least recently used. A database is created (tables
+    included) the first time its profile is used.
+    """
+
+    def __init__(self, config: Settings = settings):
+        self.config = config
+        self.max_open = config.max_open_profiles
+        self._lock = threading.Lock()
+        self._default: Shard | None = None
+        self._open: OrderedDict[str, Shard] = OrderedDict()
+        self.opened = 0
+        self.evicted = 0
+
+    def get(self, profile: str = DEFAULT_PROFILE, create: bool = False) -> Shard:
+        """
+        Returns the shard of a profile, opening it if needed.
+
+        Opening (and migrating) a database happens outside the pool lock,
+        so lookups of other profiles do not wait for it. Only `create`
+        makes a new profile; requests must not be able to add files.
+
+        :param profile: Profile name
+        :type profile: str
+        :param create: Create the profile's database if it does not exist
+        :type create: bool
+        :return: The profile's shard
+        :rtype: Shard
+        :raises ValueError: The name is not a valid profile name
+        :raises LookupError: The profile does not exist and create is False
+        """
+        shard = self.lookup(profile)
+        if shard is not None:
+            return shard
+
+        db_path = self._checked_path(profile, create)
+        return self._install(profile, self._open_shard(profile, db_path))
+
+    async def get_async(self, profile: str = DEFAULT_PROFILE, create: bool = False) -> Shard:
+        """
+        Async version of get: an open shard is returned directly, a new
+        one is opened (and migrated) on a worker thread so the event loop
+        keeps serving other requests meanwhile.
+        """
+        shard = self.lookup(profile)
+        if shard is not None:
+            return shard
+
+        db_path = self._checked_path(profile, create)
+        opened = await asyncio.to_thread(self._open_shard, profile, db_path)
+        return self._install(profile, opened)
+
+    def _checked_path(self, profile: str, create: bool) -> Path:
+        db_path = self.config.profile_db_path(profile)
+
+        if profile != DEFAULT_PROFILE and not create and not db_path.exists():
+            raise LookupError(f"Unknown profile: {profile}")
+
+        return db_path
+
+    def _install(self, profile: str, opened: Shard) -> Shard:
+        """
+        Add a newly opened shard to the pool, evicting the least recently
+        used one when full. If another caller opened the profile
+        meanwhile, theirs is kept and this one closed.
+        """
+        evicted = None
+
+        with self._lock:
+            if profile == DEFAULT_PROFILE:
+                shard = self._default
+                if shard is None:
+                    shard = self._default = opened
+                    self.opened += 1
+            else:
+                shard = self._open.get(profile)
+                if shard is None:
+                    shard = self._open[profile] = opened
+                    self.opened += 1
+                    if len(self._open) > self.max_open:
+                        _, evicted = self._open.popitem(last=False)
+                        self.evicted += 1
+
+        if shard is not opened and profile != DEFAULT_PROFILE:
+            opened.dispose()
+
+        if evicted is not None:
+            logger.info("closing profile %s (LRU)", evicted.profile)
+            evicted.dispose()
+
+        return shard
+
+    def lookup(self, profile: str = DEFAULT_PROFILE) -> Shard | None:
+        """
+        Returns the shard of a profile if it is open, without any I/O.
+
+        :param profile: Profile name
+        :type profile: str
+        :return: The open shard, or None
+        :rtype: Shard | None
+        """
+        with self._lock:
+            if profile == DEFAULT_PROFILE:
+                return self._default
+
+            shard = self._open.get(profile)
+            if shard is not None:
+                self._open.move_to_end(profile)
+            return shard
+
+    def open_shards(self) -> list[Shard]:
+        """Returns the open shards, the default profile's first if it is open."""
+        with self._lock:
+            return [shard for shard in (self._default, *self._open.values()) if shard is not None]
+
+    def caches(self) -> list[VersionedCache]:
+        """Returns the read cache of the default profile and of every open profile."""
+        with self._lock:
+            return [dashboard_cache, *(shard.cache for shard in self._open.values())]
+
+    def _open_shard(self, profile: str, db_path: Path) -> Shard:
+        shard = Shard(profile, db_path, self.config)
+        init_db(shard.engine)
+        return shard
+
+    def profiles(self) -> list[str]:
+        """
+        Returns every known profile: the default one, then one per database
+        file in profiles_dir, sorted by name.
+
+        :return: Profile names
+        :rtype: list[str]
+        """
+        names = set()
+        if self.config.profiles_dir.is_dir():
+            names = {
+                path.stem for path in self.config.profiles_dir.glob("*.db")
+                if PROFILE_NAME.match(path.stem)
+            }
+
+        names.discard(DEFAULT_PROFILE)
+        return [DEFAULT_PROFILE, *sorted(names)]
+
+    def stats(self) -> dict:
+        """
+        Returns pool statistics.
+
+        :return: Dictionary with 'open', 'max_open', 'opened' and 'evicted' keys
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "open": list(self._open),
+                "max_open": self.max_open,
+                "opened": self.opened,
+                "evicted": self.evicted,
+            }
+
+
+shards = ShardPool()
+
+
+def for_each_profile(
+    work: Callable[[Session], Any],
+    profiles: list[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Run `work(db)` for every profile, each with its own session, on up to
+    profile_workers threads. Profiles are separate files, so their writes
+    do not wait on each other.
+
+    :param work: Callable receiving a session of the profile
+    :type work: Callable[[Session], Any]
+    :param profiles: Profiles to visit (defaults to every known profile)
+    :type profiles: list[str] | None
+    :return: Dictionary mapping each profile to the result or the exception raised
+    :rtype: dict[str, Any]
+    """
+    if profiles is None:
+        profiles = shards.profiles()
+
+    def run(profile: str):
+        try:
+            db = shards.get(profile).SessionLocal()
+        except Exception as e:
+            logger.exception("profile %s could not be opened", profile)
+            return e
+
+        try:
+            return work(db)
+        except Exception as e:
+            logger.exception("profile %s failed", profile)
+            return e
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(settings.profile_workers, len(profiles))),
+        thread_name_prefix="profile",
+    ) as executor:
+        return dict(zip(profiles, executor.map(run, profiles)))
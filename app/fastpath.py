@@ -0,0 +1,182 @@
+"""
+Raw sqlite3 queries for the quick CLI commands (`todo status`, `todo list`,
+`todo done`). Nothing here imports SQLAlchemy, FastAPI or the models, so
+these commands start fast enough for shell prompts and status bars.
+
+Every function returns None when today's tasks have not been generated
+yet; the caller then opens the day through the regular services and
+retries.
+"""
+import sqlite3
+from datetime import datetime, timedelta, date
+from pathlib import Path
+
+
+def connect(db_path: Path, busy_timeout_ms: int = 5000) -> sqlite3.Connection | None:
+    """
+    Open an existing database, or return None if it does not exist yet.
+    Transactions are managed explicitly (BEGIN IMMEDIATE for writes).
+    """
+    try:
+        return sqlite3.connect(
+            f"file:{db_path}?mode=rw", uri=True,
+            timeout=busy_timeout_ms / 1000, isolation_level=None,
+        )
+    except sqlite3.OperationalError:
+        return None
+
+
+def today_progress(conn: sqlite3.Connection, today: date) -> dict | None:
+    """
+    Returns today's 'completed', 'total', 'percent' and 'streak', read
+    from the day summary and the streak projection.
+    """
+    try:
+        summary = conn.execute(
+            "SELECT completed_tasks, total_tasks, completion_pct FROM day_summary WHERE date = ?",
+            (today.isoformat(),),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None  # schema not created yet
+
+    if summary is None:
+        return None
+
+    streak = conn.execute(
+        "SELECT current_end, current_length FROM streak_state WHERE id = 1"
+    ).fetchone()
+
+    completed, total, percent = summary
+    return {
+        "completed": completed,
+        "total": total,
+        "percent": percent,
+        "streak": streak[1] if streak and streak[0] == today.isoformat() else 0,
+    }
+
+
+def today_tasks(conn: sqlite3.Connection, today: date) -> list[tuple[str, bool]] | None:
+    """Returns today's (name, completed) pairs in template order."""
+    if today_progress(conn, today) is None:
+        return None
+
+    rows = conn.execute(
+        """
+        SELECT t.name, d.completed
+        FROM daily_tasks d JOIN task_templates t ON t.id = d.task_id
+        WHERE d.task_date = ?
+        ORDER BY t.id
+        """,
+        (today.isoformat(),),
+    ).fetchall()
+
+    return [(name, bool(completed)) for name, completed in rows]
+
+
+def complete_by_name(conn: sqlite3.Connection, today: date, name: str) -> tuple[str, bool] | None:
+    """
+    Mark today's task matching `name` as done, updating the day summary and
+    the streak projection in the same transaction.
+
+    The name matches case-insensitively: an exact match wins, otherwise it
+    must be the start of exactly one task name.
+
+    :return: (task name, whether this call completed it), or None if the
+             day is not opened yet
+    :raises LookupError: No task matches, or the prefix is ambiguous
+    """
+    tasks = today_tasks(conn, today)
+    if tasks is None:
+        return None
+
+    wanted = name.strip().casefold()
+    matches = [task for task in tasks if task[0].casefold() == wanted]
+    if not matches:
+        matches = [task for task in tasks if task[0].casefold().startswith(wanted)]
+
+    if not matches:
+        raise LookupError(f"No task named '{name}' today")
+    if len(matches) > 1:
+        raise LookupError(
+            f"'{name}' matches several tasks: " + ", ".join(task for task, _ in matches)
+        )
+
+    task_name, done = matches[0]
+    if done:
+        return task_name, False
+
+    day = today.isoformat()
+    # Same text format SQLAlchemy uses for DateTime columns on SQLite
+    now = datetime.utcnow().isoformat(sep=" ", timespec="microseconds")
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        changed = conn.execute(
+            """
+            UPDATE daily_tasks SET completed = 1, completed_at = ?
+            WHERE task_date = ? AND completed = 0
+              AND task_id = (SELECT id FROM task_templates WHERE name = ?)
+            """,
+            (now, day, task_name),
+        ).rowcount
+
+        if changed:
+            conn.execute(
+                """
+                UPDATE day_summary
+                SET completed_tasks = completed_tasks + 1,
+                    completion_pct = (completed_tasks + 1) * 100.0 / total_tasks
+                WHERE date = ? AND total_tasks > 0
+                """,
+                (day,),
+            )
+            _record_perfect_day(conn, today)
+            _bump_data_version(conn)
+
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    return task_name, bool(changed)
+
+
+def _record_perfect_day(conn: sqlite3.Connection, today: date):
+    """
+    SQL counterpart of streaks.record_day() for today turning perfect:
+    extend the run that ended yesterday or start a new one. Without a
+    streak row nothing is written; the app rebuilds it on first use.
+    """
+    day = today.isoformat()
+    yesterday = (today - timedelta(days=1)).isoformat()
+
+    conn.execute(
+        """
+        UPDATE streak_state
+        SET current_start = CASE WHEN current_end = :yesterday THEN current_start ELSE :day END,
+            current_length = CASE WHEN current_end = :yesterday THEN current_length + 1 ELSE 1 END,
+            best_length = MAX(best_length, CASE WHEN current_end = :yesterday THEN current_length + 1 ELSE 1 END),
+            current_end = :day
+        WHERE id = 1
+          AND (current_end IS NULL OR current_end < :day)
+          AND (SELECT completion_pct FROM day_summary WHERE date = :day) >= 100
+        """,
+        {"day": day, "yesterday": yesterday},
+    )
+
+
+def _bump_data_version(conn: sqlite3.Connection):
+    """
+    SQL counterpart of cache.bump_data_version(): tell running servers
+    their caches are stale. Databases from before the stamp table existed
+    have no server to notify.
+    """
+    try:
+        conn.execute(
+            """
+            INSERT INTO data_version (id, version) VALUES (1, 1)
+            ON CONFLICT (id) DO UPDATE SET version = version + 1
+            """
+        )
+    except sqlite3.OperationalError:
+        pass  # no data_version table yet
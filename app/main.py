@@ -1,9 +1,14 @@
-from pathlib import Path
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+import time
+from fastapi import FastAPI, Request
 
+from app.assets import CompressionMiddleware, GZIP_LEVEL, GZIP_MINIMUM_SIZE
+from app.config import settings
 from app.database.init_db import init_db
-from app.routes import home, tasks, create, dashboard
+from app.metrics import registry, current_request_stats, RequestStats, log_slow_request
+from app.routes import home, tasks, create, dashboard, api, metrics, export, health, assets, profiles
+from app.scheduler import scheduler
+from app.database.shards import shards
+from app.services.cache import VersionRefresher
 
 app = FastAPI(title="Daily Todo")
 
@@ -12,18 +17,72 @@ app.include_router(home.router)
 app.include_router(tasks.router)
 app.include_router(create.router)
 app.include_router(dashboard.router)
+app.include_router(api.router)
+app.include_router(metrics.router)
+app.include_router(export.router)
+app.include_router(health.router)
+app.include_router(assets.router)
+app.include_router(profiles.router)
+
+# --- Request Metrics ---
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    started = time.perf_counter()
+
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_stats.reset(token)
+
+    elapsed = time.perf_counter() - started
+
+    # Label by route template (e.g. /tasks/{task_id}/complete), not raw path
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", "unmatched")
+    registry.observe_request(request.method, route_path, response.status_code, elapsed, stats)
+
+    if settings.slow_request_ms and elapsed * 1000 >= settings.slow_request_ms:
+        log_slow_request(request.method, request.url.path, elapsed, stats, settings.slow_request_queries)
+
+    return response
 
 # --- Startup Hook ---
 @app.on_event("startup")
 def startup_event():
     init_db()
 
-# --- Static Files ---
+# --- Background Rollover ---
+@app.on_event("startup")
+async def start_scheduler():
+    if settings.scheduler_enabled:
+        scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    await scheduler.stop()
+
+# --- Data Version ---
+# Follows writes of other processes off the event loop
+version_refresher = VersionRefresher(shards.caches)
+
+@app.on_event("startup")
+async def start_version_refresher():
+    version_refresher.start()
 
-BASE_DIR = Path(__file__).resolve().parent
-STATIC_DIR = BASE_DIR / "static"
+@app.on_event("shutdown")
+async def stop_version_refresher():
+    await version_refresher.stop()
 
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+# --- Response Compression ---
+# Static files are precompressed and exports have their own ?gzip option
+app.add_middleware(
+    CompressionMiddleware,
+    exclude=("/static", "/export"),
+    minimum_size=GZIP_MINIMUM_SIZE,
+    compresslevel=GZIP_LEVEL,
+)
 
 
 # --- Health Check ---
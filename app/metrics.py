@@ -0,0 +1,209 @@
+import heapq
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("app.metrics")
+
+# Latency buckets (seconds) and queries-per-request buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+# How many statements a request keeps for the slow-request log
+WORST_QUERIES_KEPT = 5
+
+
+class RequestStats:
+    """SQL statistics collected while serving one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self._worst: list[tuple[float, int, str]] = []
+
+    def record(self, statement: str, seconds: float):
+        self.queries += 1
+        self.sql_seconds += seconds
+
+        entry = (seconds, self.queries, statement)
+        if len(self._worst) < WORST_QUERIES_KEPT:
+            heapq.heappush(self._worst, entry)
+        else:
+            heapq.heappushpop(self._worst, entry)
+
+    def worst_queries(self, limit: int = WORST_QUERIES_KEPT) -> list[tuple[float, str]]:
+        """The slowest statements of the request, slowest first."""
+        return [
+            (seconds, statement)
+            for seconds, _, statement in sorted(self._worst, reverse=True)[:limit]
+        ]
+
+
+# Stats of the request being served; unset outside of requests.
+# The object is mutated in place, so copies of the context (threadpool,
+# greenlets, tasks) all report to the same request.
+current_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.total += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    """In-process request and SQL metrics, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: dict[tuple, Histogram] = {}
+        self.query_counts: dict[tuple, Histogram] = {}
+        self.requests: dict[tuple, int] = {}
+        self.sql_queries: dict[tuple, int] = {}
+        self.sql_seconds: dict[tuple, float] = {}
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+
+        with self._lock:
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.query_counts.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(stats.queries)
+            self.requests[key + (str(status),)] = self.requests.get(key + (str(status),), 0) + 1
+            self.sql_queries[key] = self.sql_queries.get(key, 0) + stats.queries
+            self.sql_seconds[key] = self.sql_seconds.get(key, 0.0) + stats.sql_seconds
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.query_counts.clear()
+            self.requests.clear()
+            self.sql_queries.clear()
+            self.sql_seconds.clear()
+
+    def render(self, extra: dict[str, float] | None = None) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        :param extra: Additional gauges as {name: value}
+        :type extra: dict[str, float] | None
+        :return: The exposition text
+        :rtype: str
+        """
+        lines = []
+
+        with self._lock:
+            _render_histograms(
+                lines, "daily_todo_request_duration_seconds",
+                "Request latency by route.", self.latency
+            )
+            _render_histograms(
+                lines, "daily_todo_sql_queries_per_request",
+                "SQL statements issued per request.", self.query_counts
+            )
+            _render_counter(
+                lines, "daily_todo_requests_total", "Requests served.",
+                self.requests, ("method", "route", "status")
+            )
+            _render_counter(
+                lines, "daily_todo_sql_queries_total", "SQL statements issued by requests.",
+                self.sql_queries, ("method", "route")
+            )
+            _render_counter(
+                lines, "daily_todo_sql_duration_seconds_total", "Time spent in SQL by requests.",
+                self.sql_seconds, ("method", "route")
+            )
+
+        for name, value in (extra or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    return ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_histograms(lines: list, name: str, help_text: str, histograms: dict):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+
+    for key, hist in sorted(histograms.items()):
+        labels = _labels(("method", "route"), key)
+        for bound, count in zip(hist.buckets, hist.counts):
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.total}')
+        lines.append(f"{name}_sum{{{labels}}} {_format_value(hist.sum)}")
+        lines.append(f"{name}_count{{{labels}}} {hist.total}")
+
+
+def _render_counter(lines: list, name: str, help_text: str, values: dict, label_names: tuple):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+
+    for key, value in sorted(values.items()):
+        lines.append(f"{name}{{{_labels(label_names, key)}}} {_format_value(value)}")
+
+
+registry = MetricsRegistry()
+
+
+def instrument_engine(sql_engine: Engine):
+    """
+    Count statements and SQL time for the current request on an engine.
+    Pass `async_engine.sync_engine` for async engines.
+    """
+    event.listen(sql_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sql_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # A connection runs one statement at a time, so a single start time
+    # suffices; a failed statement's (no after event) is simply overwritten
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started")
+    stats = current_request_stats.get()
+
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def log_slow_request(method: str, path: str, seconds: float, stats: RequestStats, worst: int):
+    """Emit one log line for a slow request, listing its slowest statements."""
+    queries = " | ".join(
+        f"{query_seconds * 1000:.1f}ms {' '.join(statement.split())[:200]}"
+        for query_seconds, statement in stats.worst_queries(worst)
+    )
+
+    logger.warning(
+        "slow request %s %s took %.1fms (%d queries, %.1fms SQL) worst: %s",
+        method, path, seconds * 1000, stats.queries, stats.sql_seconds * 1000, queries or "-"
+    )
@@ -0,0 +1,157 @@
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, Query, Request, Response, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import DEFAULT_PROFILE
+from app.database.dependencies import get_async_db
+from app.services.cache import get_data_version
+from app.services.daily_generator import ensure_day_opened_async
+from app.services.date_service import get_logical_date
+from app.services.task_service import get_today_tasks_async
+from app.services.rollups import get_history, GRANULARITIES
+from app.services.analytics import get_analytics_async
+from app.services.dashboard_service import (
+    get_today_progress_async,
+    get_dashboard_data_async,
+    CONSISTENCY_WINDOWS,
+)
+
+router = APIRouter(prefix="/api")
+
+
+def _current_etag(db: AsyncSession) -> str:
+    """Strong ETag for the data as of now: profile + logical date + data version."""
+    profile = db.info.get("profile", DEFAULT_PROFILE)
+    return f'"{profile}-{get_logical_date().isoformat()}-{get_data_version(db)}"'
+
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already matches the ETag."""
+    if_none_match = request.headers.get("if-none-match")
+
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _json_response(payload, etag: str) -> JSONResponse:
+    """JSON response that clients must revalidate with the ETag."""
+    return JSONResponse(
+        jsonable_encoder(payload),
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+
+def _not_modified_response(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+
+@router.get("/today")
+async def api_today(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Today's tasks as JSON."""
+    await ensure_day_opened_async(db)
+
+    etag = _current_etag(db)
+    if _is_not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    tasks, today = await get_today_tasks_async(db)
+
+    return _json_response({
+        "date": today,
+        "tasks": [
+            {
+                "id": task.id,
+                "task_id": task.task_id,
+                "name": task_name,
+                "completed": task.completed,
+                "completed_at": task.completed_at
+            }
+            for task, task_name in tasks
+        ]
+    }, etag)
+
+
+@router.get("/progress")
+async def api_progress(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Today's progress summary as JSON."""
+    etag = _current_etag(db)
+    if _is_not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    progress = await get_today_progress_async(db)
+
+    return _json_response({"date": get_logical_date(), **progress}, etag)
+
+
+@router.get("/dashboard")
+async def api_dashboard(request: Request, window: int | None = None, db: AsyncSession = Depends(get_async_db)):
+    """Dashboard metrics as JSON."""
+    if window not in CONSISTENCY_WINDOWS:
+        window = None
+
+    etag = _current_etag(db)
+    if _is_not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    data = await get_dashboard_data_async(db, window)
+
+    return _json_response(data, etag)
+
+
+@router.get("/history")
+async def api_history(
+    request: Request,
+    granularity: str = "week",
+    start: date | None = Query(None, alias="from"),
+    end: date | None = Query(None, alias="to"),
+    task_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Weekly or monthly completion history for the periods overlapping
+    [from, to] (default: the last year), read from the rollup tables.
+    """
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail="granularity must be week or month")
+
+    end = end or get_logical_date()
+    start = start or end - timedelta(days=365)
+
+    if start > end:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+
+    etag = _current_etag(db)
+    if _is_not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    history = await db.run_sync(get_history, granularity, start, end, task_id)
+
+    return _json_response({
+        "granularity": granularity,
+        "from": start,
+        "to": end,
+        "periods": history
+    }, etag)
+
+
+@router.get("/analytics")
+async def api_analytics(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Year heatmap, rolling 7/30-day completion per task (latest values and
+    the last 90 days), streaks and the most correlated task pairs.
+    """
+    etag = _current_etag(db)
+    if _is_not_modified(request, etag):
+        return _not_modified_response(etag)
+
+    analytics = await get_analytics_async(db)
+
+    return _json_response(analytics, etag)
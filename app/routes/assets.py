@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.assets import assets, STATIC_PREFIX
+
+router = APIRouter(prefix=STATIC_PREFIX)
+
+# Fingerprinted URLs never change content; plain ones must be revalidated
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+@router.get("/{name:path}")
+def static_file(name: str, request: Request):
+    """
+    Serve a static file from memory, brotli or gzip compressed when the
+    client accepts it. Fingerprinted names (from static_url()) are cached
+    for a year; plain names revalidate with the ETag.
+    """
+    asset, fingerprinted = assets.lookup(name)
+
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    headers = {
+        "ETag": f'"{asset.digest}"',
+        "Cache-Control": IMMUTABLE if fingerprinted else REVALIDATE,
+        "Vary": "Accept-Encoding",
+    }
+
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    encoding, body = asset.negotiate(request.headers.get("accept-encoding", ""))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    return Response(body, media_type=asset.media_type, headers=headers)
@@ -1,4 +1,8 @@
 from fastapi.templating import Jinja2Templates
 
+from app.assets import assets
+
 templates = Jinja2Templates(directory="app/templates")
 
+# {{ static_url('style.css') }} -> /static/style.<hash>.css
+templates.env.globals["static_url"] = assets.url
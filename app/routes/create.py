@@ -1,37 +1,103 @@
-from fastapi import APIRouter, Depends, Request, Form
+from fastapi import APIRouter, Depends, Request, Form, HTTPException
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.dependencies import get_db
-from app.services.task_service import create_task_template, toggle_task_template
-from app.database.models import TaskTemplate
+from app.database.dependencies import get_async_db
+from app.services.date_service import get_logical_date
+from app.services.recurrence import WEEKDAYS, weekday_mask, validate_rule, describe, next_due, is_due
+from app.services.task_service import (
+    list_task_templates_async,
+    create_task_template_async,
+    toggle_task_template_async,
+    update_task_recurrence_async,
+)
 from app.routes.base import templates
 
 router = APIRouter(prefix="/create")
 
+
+def _rule_from_form(repeat: str, weekdays: list[str], interval_days: str, month_day: str) -> dict:
+    """
+    Turn the repeat fields of the form into recurrence arguments.
+
+    :raises HTTPException: 400 for an unknown choice or an invalid value
+    """
+    try:
+        if repeat == "daily":
+            rule = {}
+        elif repeat == "weekdays":
+            rule = {"weekday_mask": weekday_mask(weekdays)}
+        elif repeat == "interval":
+            rule = {"interval_days": int(interval_days)}
+        elif repeat == "monthly":
+            rule = {"month_day": int(month_day)}
+        else:
+            raise ValueError(f"Unknown repeat choice: {repeat}")
+
+        validate_rule(**rule)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return rule
+
+
 @router.get("/")
-def show_create_page(request: Request, db: Session = Depends(get_db)):
-    """Display the task creation page with existing templates."""
-    templates_list = db.query(TaskTemplate).all()
+async def show_create_page(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Display the task creation page with existing templates and their schedules."""
+    templates_list = await list_task_templates_async(db)
+    today = get_logical_date()
+
+    schedules = {
+        t.id: {
+            "rule": describe(t),
+            "next_due": today if is_due(t, today) else next_due(t, today),
+        }
+        for t in templates_list
+    }
 
     return templates.TemplateResponse(
         "create.html",
         {
             "request": request,
-            "templates": templates_list
+            "templates": templates_list,
+            "schedules": schedules,
+            "weekdays": WEEKDAYS,
         }
     )
 
 
 @router.post("/add")
-def add_task(name: str = Form(...), db: Session = Depends(get_db)):
-    """Add a new task template."""
-    create_task_template(db, name)
+async def add_task(
+    name: str = Form(...),
+    repeat: str = Form("daily"),
+    weekdays: list[str] = Form([]),
+    interval_days: str = Form(""),
+    month_day: str = Form(""),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Add a new task template, due every day or on a recurrence rule."""
+    rule = _rule_from_form(repeat, weekdays, interval_days, month_day)
+    await create_task_template_async(db, name, **rule)
     return RedirectResponse("/create", status_code=303)
 
 
 @router.post("/{template_id}/toggle")
-def toggle_task(template_id: int, db: Session = Depends(get_db)):
+async def toggle_task(template_id: int, db: AsyncSession = Depends(get_async_db)):
     """Toggle the active status of a task template."""
-    toggle_task_template(db, template_id)
+    await toggle_task_template_async(db, template_id)
+    return RedirectResponse("/create", status_code=303)
+
+
+@router.post("/{template_id}/repeat")
+async def change_repeat(
+    template_id: int,
+    repeat: str = Form("daily"),
+    weekdays: list[str] = Form([]),
+    interval_days: str = Form(""),
+    month_day: str = Form(""),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Change the recurrence rule of a task template."""
+    rule = _rule_from_form(repeat, weekdays, interval_days, month_day)
+    await update_task_recurrence_async(db, template_id, **rule)
     return RedirectResponse("/create", status_code=303)
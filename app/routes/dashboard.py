@@ -1,21 +1,35 @@
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.dependencies import get_db
-from app.services.dashboard_service import get_dashboard_data
+from app.database.dependencies import get_async_db, get_async_shard
+from app.database.shards import Shard
+from app.services.dashboard_service import get_dashboard_data_async, CONSISTENCY_WINDOWS
+from app.services.analytics import get_analytics_async
 from app.routes.base import templates
 
 router = APIRouter(prefix="/dashboard")
 
 @router.get("/")
-def dashboard(request: Request, db: Session = Depends(get_db)):
+async def dashboard(request: Request, window: int | None = None, db: AsyncSession = Depends(get_async_db)):
     """Display the dashboard with aggregated data."""
-    data = get_dashboard_data(db)
+    if window not in CONSISTENCY_WINDOWS:
+        window = None
+
+    data = await get_dashboard_data_async(db, window)
+    analytics = await get_analytics_async(db)
 
     return templates.TemplateResponse(
         "dashboard.html",
         {
             "request": request,
-            "data": data
+            "data": data,
+            "analytics": analytics,
+            "windows": CONSISTENCY_WINDOWS
         }
     )
+
+
+@router.get("/cache")
+async def cache_stats(shard: Shard = Depends(get_async_shard)):
+    """Expose hit/miss statistics of the dashboard cache of the request's profile."""
+    return shard.cache.stats()
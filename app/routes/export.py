@@ -0,0 +1,70 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.database.dependencies import get_shard
+from app.database.shards import Shard
+from app.services.export_service import (
+    iter_export,
+    gzip_chunks,
+    EXPORT_TABLES,
+    EXPORT_FORMATS,
+)
+
+router = APIRouter(prefix="/export")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _stream(shard: Shard, table: str, fmt: str, start: date | None, end: date | None):
+    """
+    Run the export on a session of its own: the response body is produced
+    after the endpoint has returned, when a request-scoped session would
+    already be closed.
+    """
+    db = shard.SessionLocal()
+    try:
+        yield from iter_export(db, table, fmt, start, end)
+    finally:
+        db.close()
+
+
+@router.get("/{table}.{fmt}")
+async def export_table(
+    table: str,
+    fmt: str,
+    start: date | None = Query(None, alias="from"),
+    end: date | None = Query(None, alias="to"),
+    gzip: bool = False,
+    shard: Shard = Depends(get_shard),
+):
+    """
+    Stream daily_tasks or day_summary as CSV or NDJSON, optionally
+    restricted to [from, to] and gzip-compressed.
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail="Unknown export")
+
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=404, detail="Unknown export format")
+
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+
+    filename = f"{table}.{fmt}"
+    body = _stream(shard, table, fmt, start, end)
+    media_type = MEDIA_TYPES[fmt]
+
+    if gzip:
+        filename += ".gz"
+        body = gzip_chunks(body)
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.scheduler import scheduler
+
+router = APIRouter()
+
+@router.get("/ready")
+async def readiness():
+    """
+    Readiness probe: 200 once today's logical day is generated, 503 before.
+    Reports the last rollover of the background scheduler.
+    """
+    status = scheduler.status()
+
+    return JSONResponse(
+        jsonable_encoder(status),
+        status_code=200 if status["ready"] else 503,
+        headers={"Cache-Control": "no-store"}
+    )
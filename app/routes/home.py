@@ -1,22 +1,22 @@
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.dependencies import get_db
-from app.services.daily_generator import ensure_day_exists
-from app.services.task_service import get_today_tasks
-from app.services.dashboard_service import get_today_progress
+from app.database.dependencies import get_async_db
+from app.services.daily_generator import ensure_day_opened_async
+from app.services.task_service import get_today_tasks_async
+from app.services.dashboard_service import get_today_progress_async
 from app.routes.base import templates
 
 router = APIRouter()
 
 @router.get("/")
-def home(request: Request, db: Session = Depends(get_db)):
+async def home(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Display today's tasks and progress on the home page."""
-    # Safety net: ensure today exists
-    ensure_day_exists(db)
+    # Safety net: ensure today exists (free after the first request of the day)
+    await ensure_day_opened_async(db)
 
-    tasks, today = get_today_tasks(db)
-    progress = get_today_progress(db)
+    tasks, today = await get_today_tasks_async(db)
+    progress = await get_today_progress_async(db)
 
     return templates.TemplateResponse(
         "home.html",
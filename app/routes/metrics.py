@@ -0,0 +1,32 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.database.shards import shards
+from app.metrics import registry
+from app.services.cache import dashboard_cache
+
+# Cache counters summed over the open profiles
+CACHE_COUNTERS = ("hits", "misses", "evictions", "entries")
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Expose request, SQL and cache metrics in Prometheus text format. Cache
+    counters cover every open profile; the data version is the default one's.
+    """
+    caches = [shard.cache.stats() for shard in shards.open_shards()] or [dashboard_cache.stats()]
+    pool = shards.stats()
+
+    body = registry.render({
+        **{
+            f"daily_todo_cache_{counter}": sum(cache[counter] for cache in caches)
+            for counter in CACHE_COUNTERS
+        },
+        "daily_todo_data_version": dashboard_cache.stats()["version"],
+        "daily_todo_profiles_open": len(pool["open"]),
+        "daily_todo_profiles_evicted": pool["evicted"],
+    })
+
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
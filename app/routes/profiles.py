@@ -0,0 +1,54 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, RedirectResponse
+
+from app.database.dependencies import resolve_profile, PROFILE_COOKIE
+from app.database.shards import shards
+
+router = APIRouter(prefix="/profiles")
+
+# The profile cookie outlives browser sessions (one year)
+PROFILE_COOKIE_MAX_AGE = 365 * 24 * 3600
+
+@router.get("")
+async def list_profiles(request: Request):
+    """Known profiles, the request's current one and the open-database pool."""
+    return JSONResponse(
+        {
+            "current": resolve_profile(request),
+            "profiles": shards.profiles(),
+            "pool": shards.stats(),
+        },
+        headers={"Cache-Control": "no-store"}
+    )
+
+
+@router.get("/{profile}")
+async def switch_profile(profile: str):
+    """Make an existing `profile` the browser's profile (cookie) and go to the home page."""
+    try:
+        await shards.get_async(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return _select_profile(profile)
+
+
+@router.post("/{profile}")
+async def create_profile(profile: str):
+    """Create `profile` (if new), make it the browser's profile and go to the home page."""
+    try:
+        await shards.get_async(profile, create=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return _select_profile(profile)
+
+
+def _select_profile(profile: str) -> RedirectResponse:
+    response = RedirectResponse("/", status_code=303)
+    response.set_cookie(
+        PROFILE_COOKIE, profile, max_age=PROFILE_COOKIE_MAX_AGE, httponly=True, samesite="lax"
+    )
+    return response
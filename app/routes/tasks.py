@@ -1,30 +1,120 @@
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+import json
+from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi.responses import RedirectResponse, JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.dependencies import get_db
-from app.services.task_service import get_today_tasks, complete_task
+from app.database.dependencies import get_async_db
+from app.services.task_service import (
+    get_today_tasks_async,
+    get_task_name_async,
+    complete_task_async,
+    complete_tasks_async,
+    uncomplete_task_async,
+)
+from app.services.dashboard_service import get_today_progress_async
 from app.routes.base import templates
 
 router = APIRouter(prefix="/tasks")
 
+# Request header asking for the changed fragments instead of a redirect
+FRAGMENT_HEADER = "X-Fragment"
+
+
+def _wants_fragment(request: Request) -> bool:
+    return request.headers.get(FRAGMENT_HEADER, "") not in {"", "0", "false"}
+
+
+async def _task_response(request: Request, db: AsyncSession, task):
+    """
+    Answer a single-task change: the task's <li> and the progress block
+    for fragment requests, otherwise the redirect of the full-page flow.
+    """
+    if not _wants_fragment(request):
+        return RedirectResponse("/tasks/today", status_code=303)
+
+    return templates.TemplateResponse(
+        "partials/task_fragment.html",
+        {
+            "request": request,
+            "task": task,
+            "task_name": await get_task_name_async(db, task.task_id),
+            "progress": await get_today_progress_async(db),
+        },
+        headers={"Cache-Control": "no-store", "Vary": FRAGMENT_HEADER}
+    )
+
 @router.get("/today")
-def show_today_tasks(request: Request, db: Session = Depends(get_db)):
+async def show_today_tasks(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Display today's tasks for marking completion."""
-    tasks, today = get_today_tasks(db)
+    tasks, today = await get_today_tasks_async(db)
+    progress = await get_today_progress_async(db)
 
     return templates.TemplateResponse(
         "mark.html",
         {
             "request": request,
             "tasks": tasks,
-            "today": today
+            "today": today,
+            "progress": progress
         }
     )
 
 
+@router.post("/complete-batch")
+async def mark_tasks_complete(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Mark several tasks as complete in one transaction.
+    Accepts a form with repeated `task_ids` fields or a JSON body
+    `{"task_ids": [...]}`.
+    """
+    is_json = request.headers.get("content-type", "").startswith("application/json")
+
+    if is_json:
+        try:
+            body = await request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+
+        if not isinstance(body, dict):
+            raise HTTPException(status_code=400, detail="Body must be a JSON object")
+
+        raw_ids = body.get("task_ids", [])
+        if not isinstance(raw_ids, list):
+            raise HTTPException(status_code=400, detail="task_ids must be a list")
+    else:
+        form = await request.form()
+        raw_ids = form.getlist("task_ids")
+
+    try:
+        task_ids = [int(task_id) for task_id in raw_ids]
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="task_ids must be integers")
+
+    try:
+        completed = await complete_tasks_async(db, task_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    if not is_json:
+        return RedirectResponse("/tasks/today", status_code=303)
+
+    return JSONResponse({
+        "completed": completed,
+        "progress": await get_today_progress_async(db)
+    })
+
+
 @router.post("/{task_id}/complete")
-def mark_task_complete(task_id: int, db: Session = Depends(get_db)):
-    """Mark a specific task as complete."""
-    complete_task(db, task_id)
-    return RedirectResponse("/tasks/today", status_code=303)
+async def mark_task_complete(task_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Mark a specific task as complete (fragment or redirect response)."""
+    task = await complete_task_async(db, task_id)
+    return await _task_response(request, db, task)
+
+
+@router.post("/{task_id}/uncomplete")
+async def mark_task_incomplete(task_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Undo the completion of a specific task (fragment or redirect response)."""
+    task = await uncomplete_task_async(db, task_id)
+    return await _task_response(request, db, task)
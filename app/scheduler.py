@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+
+from app.database.shards import shards, for_each_profile
+from app.services.date_service import get_now, get_logical_date, get_next_reset
+from app.services.daily_generator import ensure_day_opened, get_opened_day
+from app.services.dashboard_service import get_today_progress, get_dashboard_data
+from app.services.analytics import get_analytics
+
+logger = logging.getLogger("app.scheduler")
+
+# Longest single sleep. The wall clock is re-read after every chunk, so a
+# rollover missed while the machine was suspended runs within this delay
+# of waking up.
+MAX_SLEEP_SECONDS = 60
+
+# After a failed rollover, retry after this delay, doubling up to MAX_SLEEP_SECONDS
+RETRY_INITIAL_SECONDS = 5
+
+
+class RolloverScheduler:
+    """
+    Background task that opens each logical day at DAY_RESET_HOUR for
+    every profile: generates the day's tasks (catching up on missed days)
+    and warms the read caches, so the first request of the day does not
+    pay for it. Profiles are opened in parallel.
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self.last_rollover: datetime | None = None
+        self.last_day: date | None = None
+        self.last_duration_ms: float | None = None
+        self.last_error: str | None = None
+
+    def start(self):
+        """Start the loop on the running event loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="rollover-scheduler")
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self):
+        # Open the current day right away (covers restarts and missed days)
+        await self.rollover()
+        retry_delay = RETRY_INITIAL_SECONDS
+
+        while True:
+            if self.last_error is not None:
+                # Retry a failed rollover instead of leaving the day unopened until the next one
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, MAX_SLEEP_SECONDS)
+                await self.rollover()
+                continue
+
+            retry_delay = RETRY_INITIAL_SECONDS
+            next_reset = get_next_reset()
+
+            while (remaining := (next_reset - get_now()).total_seconds()) > 0:
+                await asyncio.sleep(min(remaining, MAX_SLEEP_SECONDS))
+
+            await self.rollover()
+
+    async def rollover(self):
+        """Open the logical day and warm the caches, off the event loop."""
+        today = get_logical_date()
+        started = time.perf_counter()
+
+        try:
+            results = await asyncio.to_thread(for_each_profile, _open_and_warm)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.exception("rollover to %s failed", today)
+            return
+
+        failed = {
+            profile: f"{type(e).__name__}: {e}"
+            for profile, e in results.items()
+            if isinstance(e, Exception)
+        }
+        if failed:
+            self.last_error = "; ".join(f"{profile}: {error}" for profile, error in failed.items())
+            return
+
+        self.last_rollover = get_now()
+        self.last_day = today
+        self.last_duration_ms = (time.perf_counter() - started) * 1000
+        self.last_error = None
+
+        logger.info(
+            "opened %s for %d profile(s) in %.1fms", today, len(results), self.last_duration_ms
+        )
+
+    def status(self) -> dict:
+        """
+        Readiness information: ready once today's logical day is opened in
+        this process for every profile, by the scheduler or by requests.
+
+        :return: Dictionary with 'ready', 'running', 'logical_date',
+                 'pending_profiles', 'last_day', 'last_rollover',
+                 'last_duration_ms', 'next_rollover' and 'last_error' keys
+        :rtype: dict
+        """
+        today = get_logical_date()
+        pending = [profile for profile in shards.profiles() if get_opened_day(profile) != today]
+
+        return {
+            "ready": not pending,
+            "running": self.running,
+            "logical_date": today,
+            "pending_profiles": pending,
+            "last_day": self.last_day,
+            "last_rollover": self.last_rollover,
+            "last_duration_ms": (
+                round(self.last_duration_ms, 1) if self.last_duration_ms is not None else None
+            ),
+            "next_rollover": get_next_reset(),
+            "last_error": self.last_error,
+        }
+
+
+def _open_and_warm(db: Session):
+    """Generate a profile's logical day (if not yet) and fill its caches."""
+    ensure_day_opened(db)
+
+    get_today_progress(db)
+    get_dashboard_data(db)
+    get_analytics(db)
+
+
+scheduler = RolloverScheduler()
@@ -0,0 +1,323 @@
+from datetime import date, timedelta
+from itertools import chain
+import numpy as np
+from sqlalchemy import select, func, cast, Integer
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.models import DailyTask, TaskArchive, TaskTemplate
+from app.services.date_service import get_logical_date
+from app.services.cache import cache_for
+
+# Days shown in the calendar heatmap (ends today)
+HEATMAP_DAYS = 365
+
+# Rolling completion windows (in days), and how many days of each series the API returns
+ROLLING_WINDOWS = (7, 30)
+ROLLING_SERIES_DAYS = 90
+
+# Task pairs need this many jointly scheduled days to be correlated
+MIN_CORRELATION_DAYS = 14
+TOP_CORRELATIONS = 5
+
+# SQLite julianday() of 1970-01-01, so dates become numpy datetime64[D] values
+UNIX_EPOCH_JULIAN = 2440587.5
+
+
+class CompletionMatrix:
+    """
+    Every task instance of the history as two templates × days boolean
+    arrays: whether the task existed that day and whether it was done.
+    """
+
+    def __init__(self, task_ids: np.ndarray, names: list[str], start: date,
+                 scheduled: np.ndarray, completed: np.ndarray):
+        self.task_ids = task_ids
+        self.names = names
+        self.start = start
+        self.scheduled = scheduled
+        self.completed = completed
+
+    @property
+    def days(self) -> int:
+        return self.scheduled.shape[1]
+
+    def day(self, offset: int) -> date:
+        return self.start + timedelta(days=int(offset))
+
+
+def _epoch_days(column):
+    """SQL expression: a date column as days since 1970-01-01."""
+    return cast(func.julianday(column) - UNIX_EPOCH_JULIAN, Integer)
+
+
+def _int_array(db: Session, stmt) -> np.ndarray:
+    """Run an all-integer query into a rows × columns int64 array."""
+    # Core execution skips the ORM row processing, and flattening plain
+    # tuples is much faster than np.array() over Row objects
+    rows = db.connection().execute(stmt)
+    columns = len(rows.keys())
+
+    flat = np.fromiter(chain.from_iterable(rows.tuples()), dtype=np.int64)
+    return flat.reshape(-1, columns)
+
+
+def load_matrix(db: Session, end: date | None = None) -> CompletionMatrix:
+    """
+    Load the (task_id, task_date, completed) history, live and archived,
+    into a CompletionMatrix with one query per table.
+
+    :param db: Database session
+    :type db: Session
+    :param end: Last day of the matrix (defaults to the logical today)
+    :type end: date | None
+    :return: The completion matrix
+    :rtype: CompletionMatrix
+    """
+    if end is None:
+        end = get_logical_date()
+
+    live = _int_array(db, select(
+        DailyTask.task_id,
+        _epoch_days(DailyTask.task_date),
+        cast(DailyTask.completed, Integer),
+    ))
+
+    archived = _int_array(db, select(
+        TaskArchive.task_id,
+        _epoch_days(TaskArchive.month_start),
+        TaskArchive.scheduled,
+        TaskArchive.completed,
+    ))
+
+    # Unpack the month bitmaps: one column per day-of-month bit
+    bits = np.arange(31)
+    archived_scheduled = (archived[:, 2:3] >> bits) & 1 == 1
+    archived_done = (archived[:, 3:4] >> bits) & 1 == 1
+    archived_rows = np.broadcast_to(archived[:, 0:1], archived_scheduled.shape)
+    archived_days = archived[:, 1:2] + bits
+
+    task_col = np.concatenate([live[:, 0], archived_rows[archived_scheduled]])
+    day_col = np.concatenate([live[:, 1], archived_days[archived_scheduled]])
+    done_col = np.concatenate([live[:, 2] == 1, archived_done[archived_scheduled]])
+
+    end_day = (np.datetime64(end, "D") - np.datetime64(0, "D")).astype(np.int64)
+    keep = day_col <= end_day
+    task_col, day_col, done_col = task_col[keep], day_col[keep], done_col[keep]
+
+    names = dict(db.query(TaskTemplate.id, TaskTemplate.name).all())
+    task_ids = np.unique(task_col)
+
+    first_day = int(day_col.min()) if len(day_col) else int(end_day)
+    start = np.datetime64(first_day, "D").item()
+
+    shape = (len(task_ids), int(end_day) - first_day + 1)
+    scheduled = np.zeros(shape, dtype=bool)
+    completed = np.zeros(shape, dtype=bool)
+
+    rows = np.searchsorted(task_ids, task_col)
+    offsets = day_col - first_day
+    scheduled[rows, offsets] = True
+    completed[rows, offsets] = done_col
+
+    return CompletionMatrix(
+        task_ids, [names.get(int(task_id), "") for task_id in task_ids],
+        start, scheduled, completed,
+    )
+
+
+def daily_completion(matrix: CompletionMatrix) -> np.ndarray:
+    """Completion percentage of every day across all tasks (NaN without tasks)."""
+    total = matrix.scheduled.sum(axis=0)
+    done = matrix.completed.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, done * 100.0 / total, np.nan)
+
+
+def rolling_completion(matrix: CompletionMatrix, window: int) -> np.ndarray:
+    """
+    Per-task completion rate over the trailing `window` days, for every day
+    (templates × days, NaN where the task was not scheduled in the window).
+    """
+    def trailing_sum(values: np.ndarray) -> np.ndarray:
+        sums = np.cumsum(values, axis=1, dtype=np.int64)
+        sums[:, window:] = sums[:, window:] - sums[:, :-window]
+        return sums
+
+    total = trailing_sum(matrix.scheduled)
+    done = trailing_sum(matrix.completed)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, done * 100.0 / total, np.nan)
+
+
+def streak_lengths(matrix: CompletionMatrix) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Current and best run of consecutive completed occurrences per task.
+    Days a task was not scheduled neither extend nor break its run.
+
+    :return: (current, best) arrays, one entry per task
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    if matrix.days == 0:
+        empty = np.zeros(len(matrix.task_ids), dtype=np.int64)
+        return empty, empty
+
+    done = np.cumsum(matrix.completed, axis=1, dtype=np.int64)
+    missed = matrix.scheduled & ~matrix.completed
+
+    # Completed count at the latest miss so far; the run is what came after
+    last_miss = np.maximum.accumulate(np.where(missed, done, 0), axis=1)
+    runs = done - last_miss
+
+    return runs[:, -1], runs.max(axis=1)
+
+
+def task_correlations(matrix: CompletionMatrix) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson correlation of every pair of tasks' completion, over the days
+    both were scheduled.
+
+    :return: (correlation, overlapping days) templates × templates arrays;
+             correlations are NaN where undefined
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    s = matrix.scheduled.astype(np.float64)
+    x = matrix.completed.astype(np.float64)
+
+    n = s @ s.T
+    sum_x = x @ s.T   # completions of i on days j was scheduled
+    sum_y = sum_x.T
+    sum_xy = x @ x.T
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x, mean_y = sum_x / n, sum_y / n
+        cov = sum_xy / n - mean_x * mean_y
+        # Completion is 0/1, so E[x²] = E[x]
+        var_x = mean_x - mean_x ** 2
+        var_y = mean_y - mean_y ** 2
+        corr = cov / np.sqrt(var_x * var_y)
+
+    corr[n < MIN_CORRELATION_DAYS] = np.nan
+    return corr, n.astype(np.int64)
+
+
+def get_analytics(db: Session) -> dict:
+    """
+    Calendar heatmap, rolling 7/30-day completion, streaks and task
+    correlations, computed from one completion matrix.
+
+    :param db: Database session
+    :type db: Session
+    :return: Dictionary with 'heatmap', 'tasks', 'series' and
+             'correlations' keys
+    :rtype: dict
+    """
+    return cache_for(db).get_or_compute("analytics", lambda: _compute_analytics(db))
+
+
+def _compute_analytics(db: Session) -> dict:
+    """Uncached body of get_analytics."""
+    today = get_logical_date()
+    matrix = load_matrix(db, today)
+
+    rolling = {window: rolling_completion(matrix, window) for window in ROLLING_WINDOWS}
+    current, best = streak_lengths(matrix)
+    corr, overlap = task_correlations(matrix)
+
+    series_from = max(matrix.days - ROLLING_SERIES_DAYS, 0)
+
+    tasks = []
+    for i, (task_id, name) in enumerate(zip(matrix.task_ids, matrix.names)):
+        task = {
+            "task_id": int(task_id),
+            "task": name,
+            "current_streak": int(current[i]),
+            "best_streak": int(best[i]),
+        }
+        for window, rates in rolling.items():
+            task[f"rolling_{window}"] = _round(rates[i, -1]) if matrix.days else None
+        tasks.append(task)
+
+    return {
+        "date": today,
+        "heatmap": _heatmap(matrix, today),
+        "tasks": tasks,
+        "series": {
+            "dates": [matrix.day(offset) for offset in range(series_from, matrix.days)],
+            "rolling": {
+                str(window): {
+                    int(task_id): [_round(value) for value in rates[i, series_from:]]
+                    for i, task_id in enumerate(matrix.task_ids)
+                }
+                for window, rates in rolling.items()
+            },
+        },
+        "correlations": _top_correlations(matrix, corr, overlap),
+    }
+
+
+def _heatmap(matrix: CompletionMatrix, today: date) -> dict:
+    """Daily completion of the last HEATMAP_DAYS days, laid out in week columns."""
+    first = today - timedelta(days=HEATMAP_DAYS - 1)
+    percent = np.full(HEATMAP_DAYS, np.nan)
+
+    daily = daily_completion(matrix)
+    offset = (first - matrix.start).days
+    lo, hi = max(offset, 0), min(offset + HEATMAP_DAYS, matrix.days)
+    if lo < hi:
+        percent[lo - offset:hi - offset] = daily[lo:hi]
+
+    # 0 = nothing done, 1-4 = quartiles of completion
+    levels = np.where(np.isnan(percent), -1, np.ceil(np.nan_to_num(percent) / 25)).astype(int)
+
+    days = [
+        {
+            "date": first + timedelta(days=i),
+            "percent": _round(percent[i]),
+            "level": int(levels[i]) if levels[i] >= 0 else None,
+        }
+        for i in range(HEATMAP_DAYS)
+    ]
+
+    # Columns start on Monday; pad the first week
+    weeks = []
+    week = [None] * first.weekday()
+    for day in days:
+        week.append(day)
+        if len(week) == 7:
+            weeks.append(week)
+            week = []
+    if week:
+        weeks.append(week + [None] * (7 - len(week)))
+
+    return {"from": first, "to": today, "days": days, "weeks": weeks}
+
+
+def _top_correlations(matrix: CompletionMatrix, corr: np.ndarray, overlap: np.ndarray) -> list[dict]:
+    """The most strongly (positively or negatively) correlated task pairs."""
+    upper = np.triu(np.ones_like(corr, dtype=bool), k=1) & ~np.isnan(corr)
+    first, second = np.nonzero(upper)
+
+    strength = np.abs(corr[first, second])
+    order = np.argsort(-strength, kind="stable")[:TOP_CORRELATIONS]
+
+    return [
+        {
+            "task_a": matrix.names[first[k]],
+            "task_b": matrix.names[second[k]],
+            "r": round(float(corr[first[k], second[k]]), 3),
+            "days": int(overlap[first[k], second[k]]),
+        }
+        for k in order
+    ]
+
+
+def _round(value) -> float | None:
+    return None if np.isnan(value) else round(float(value), 1)
+
+
+async def get_analytics_async(db: AsyncSession) -> dict:
+    """Async version of get_analytics."""
+    return await db.run_sync(get_analytics)
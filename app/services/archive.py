@@ -0,0 +1,384 @@
+import calendar
+import json
+from datetime import date, datetime, timedelta
+from typing import Iterator
+from sqlalchemy import select, delete, func, cast, Integer
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.database.models import DailyTask, TaskArchive, ArchiveState, RollupState
+from app.services.date_service import get_logical_date
+
+# The state lives in a single row
+STATE_ID = 1
+
+# Live rows read per fetch, and archive rows written per executemany
+ARCHIVE_BATCH_SIZE = 5000
+
+# Full months kept in daily_tasks by `todo archive` when not configured
+DEFAULT_KEEP_MONTHS = 3
+
+
+def get_archived_through(db: Session) -> date | None:
+    """Returns the last day moved into the archive, or None."""
+    state = db.get(ArchiveState, STATE_ID)
+    return state.archived_through if state else None
+
+
+def archive_cutoff(db: Session, keep_months: int, today: date | None = None) -> date | None:
+    """
+    Returns the last day that may be archived: the end of the month before
+    the `keep_months` full months preceding the current one. Only whole
+    months that are already folded into the rollups qualify.
+
+    :param db: Database session
+    :type db: Session
+    :param keep_months: Full months to keep in daily_tasks besides the current one
+    :type keep_months: int
+    :param today: The current logical day (defaults to get_logical_date())
+    :type today: date | None
+    :return: The cutoff day, or None if nothing can be archived
+    :rtype: date | None
+    """
+    if today is None:
+        today = get_logical_date()
+
+    month = today.replace(day=1)
+    for _ in range(keep_months):
+        month = (month - timedelta(days=1)).replace(day=1)
+    cutoff = month - timedelta(days=1)
+
+    rollups = db.get(RollupState, STATE_ID)
+    closed_through = rollups.closed_through if rollups else None
+
+    if closed_through is None:
+        return None
+
+    if closed_through < cutoff:
+        cutoff = closed_through
+        if cutoff.day != calendar.monthrange(cutoff.year, cutoff.month)[1]:
+            cutoff = cutoff.replace(day=1) - timedelta(days=1)
+
+    return cutoff
+
+
+def archive_months(db: Session, cutoff: date) -> int:
+    """
+    Move every daily task up to `cutoff` into task_archive, packed into one
+    row per template per month, and delete the live rows. Months that are
+    already archived are merged with the new rows (used after imports).
+    Day summaries, streaks and rollups are not affected. The caller commits.
+
+    :param db: Database session
+    :type db: Session
+    :param cutoff: Last day to archive (the end of a month)
+    :type cutoff: date
+    :return: Number of daily task rows archived
+    :rtype: int
+    """
+    archived_through = get_archived_through(db)
+
+    rows = db.execute(
+        select(
+            DailyTask.task_id,
+            DailyTask.task_date,
+            DailyTask.completed,
+            DailyTask.completed_at,
+        )
+        .where(DailyTask.task_date <= cutoff)
+        .order_by(DailyTask.task_id, DailyTask.task_date)
+        .execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+    )
+
+    archived = 0
+    pending = []
+    key = None
+    days = []
+
+    def store():
+        task_id, month = key
+        month_days = days
+        if archived_through is not None and month <= archived_through:
+            month_days = _merge(db.get(TaskArchive, (month, task_id)), days)
+        pending.append({"task_id": task_id, "month_start": month, **_pack(month_days)})
+
+        if len(pending) >= ARCHIVE_BATCH_SIZE:
+            _write(db, pending)
+            pending.clear()
+
+    for task_id, task_date, completed, completed_at in rows:
+        if key != (task_id, task_date.replace(day=1)):
+            if key is not None:
+                store()
+            key = (task_id, task_date.replace(day=1))
+            days = []
+
+        days.append((task_date, completed, completed_at))
+        archived += 1
+
+    if key is not None:
+        store()
+    _write(db, pending)
+
+    db.execute(delete(DailyTask).where(DailyTask.task_date <= cutoff))
+
+    state = db.get(ArchiveState, STATE_ID)
+    if state is None:
+        state = ArchiveState(id=STATE_ID, archived_through=None)
+        db.add(state)
+
+    if state.archived_through is None or state.archived_through < cutoff:
+        state.archived_through = cutoff
+
+    db.flush()
+    return archived
+
+
+def _pack(days: list[tuple]) -> dict:
+    """Pack one template's (day, completed, completed_at) rows of a month."""
+    scheduled = completed = 0
+    timestamps = []
+    run = best = lead = 0
+    leading = True
+
+    for day, done, completed_at in days:
+        bit = 1 << (day.day - 1)
+        scheduled |= bit
+
+        if done:
+            completed |= bit
+            timestamps.append(completed_at.isoformat() if completed_at else None)
+            run += 1
+            best = max(best, run)
+        else:
+            if leading:
+                lead, leading = run, False
+            run = 0
+
+    if leading:
+        lead = run
+
+    return {
+        "scheduled": scheduled,
+        "completed": completed,
+        "total_tasks": len(days),
+        "completed_tasks": len(timestamps),
+        "lead_run": lead,
+        "tail_run": run,
+        "best_run": best,
+        "completed_at": json.dumps(timestamps),
+    }
+
+
+def _merge(existing: TaskArchive | None, days: list[tuple]) -> list[tuple]:
+    """Combine an archived month with live rows of the same month."""
+    if existing is None:
+        return days
+
+    merged = {day: (done, completed_at) for day, done, completed_at in unpack(existing)}
+    for day, done, completed_at in days:
+        if day in merged:
+            done_before, at_before = merged[day]
+            done, completed_at = done or done_before, completed_at or at_before
+        merged[day] = (done, completed_at)
+
+    return [(day, *merged[day]) for day in sorted(merged)]
+
+
+def _write(db: Session, values: list[dict]):
+    if not values:
+        return
+
+    stmt = insert(TaskArchive)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["month_start", "task_id"],
+        set_={
+            column: stmt.excluded[column]
+            for column in values[0]
+            if column not in {"month_start", "task_id"}
+        },
+    )
+    db.connection().execute(stmt, values)
+
+
+def unpack(row: TaskArchive) -> Iterator[tuple[date, bool, datetime | None]]:
+    """
+    Expand an archived month back into (day, completed, completed_at) rows.
+
+    :param row: An archive row (or any row with the same columns)
+    :type row: TaskArchive
+    :return: Iterator of tuples in day order
+    :rtype: Iterator[tuple[date, bool, datetime | None]]
+    """
+    timestamps = iter(json.loads(row.completed_at))
+
+    for offset in range(31):
+        bit = 1 << offset
+        if not row.scheduled & bit:
+            continue
+
+        done = bool(row.completed & bit)
+        completed_at = next(timestamps) if done else None
+
+        yield (
+            row.month_start + timedelta(days=offset),
+            done,
+            datetime.fromisoformat(completed_at) if completed_at else None,
+        )
+
+
+def archived_bit(column, day_column):
+    """SQL expression: the bit of an archive bitmap for a date column (0 or 1)."""
+    return column.op(">>")(cast(func.strftime("%d", day_column), Integer) - 1).op("&")(1)
+
+
+def iter_archived_tasks(
+    db: Session,
+    start: date | None = None,
+    end: date | None = None,
+) -> Iterator[tuple[date, int, bool, datetime | None]]:
+    """
+    Expand archived tasks into (day, task_id, completed, completed_at)
+    rows ordered by day and task, one month in memory at a time.
+
+    :param db: Database session
+    :type db: Session
+    :param start: First day (inclusive)
+    :type start: date | None
+    :param end: Last day (inclusive)
+    :type end: date | None
+    :return: Iterator of tuples
+    :rtype: Iterator[tuple[date, int, bool, datetime | None]]
+    """
+    stmt = select(TaskArchive).order_by(TaskArchive.month_start, TaskArchive.task_id)
+
+    if start is not None:
+        stmt = stmt.where(TaskArchive.month_start >= start.replace(day=1))
+    if end is not None:
+        stmt = stmt.where(TaskArchive.month_start <= end)
+
+    month = None
+    buffered = []
+
+    def flush():
+        buffered.sort()
+        for day, task_id, done, completed_at in buffered:
+            if (start is None or day >= start) and (end is None or day <= end):
+                yield day, task_id, done, completed_at
+        buffered.clear()
+
+    for row in db.scalars(stmt.execution_options(yield_per=ARCHIVE_BATCH_SIZE)):
+        if row.month_start != month:
+            yield from flush()
+            month = row.month_start
+
+        buffered.extend(
+            (day, row.task_id, done, completed_at)
+            for day, done, completed_at in unpack(row)
+        )
+
+    yield from flush()
+
+
+def archived_schedules(db: Session, keys: set[tuple[date, int]]) -> dict[tuple[date, int], int]:
+    """
+    Returns the `scheduled` bitmap of each archived (month_start, task_id)
+    in `keys` that exists.
+    """
+    if not keys:
+        return {}
+
+    months = {month for month, _ in keys}
+    task_ids = {task_id for _, task_id in keys}
+
+    rows = db.execute(
+        select(TaskArchive.month_start, TaskArchive.task_id, TaskArchive.scheduled)
+        .where(TaskArchive.month_start.in_(months), TaskArchive.task_id.in_(task_ids))
+    )
+
+    return {
+        (month, task_id): scheduled
+        for month, task_id, scheduled in rows
+        if (month, task_id) in keys
+    }
+
+
+def archived_day_counts(db: Session) -> dict[date, tuple[int, int]]:
+    """
+    Returns (total, completed) task counts for every archived day.
+
+    :param db: Database session
+    :type db: Session
+    :return: Dictionary keyed by day
+    :rtype: dict[date, tuple[int, int]]
+    """
+    counts: dict[date, tuple[int, int]] = {}
+
+    rows = db.execute(
+        select(TaskArchive.month_start, TaskArchive.scheduled, TaskArchive.completed)
+    )
+
+    for month_start, scheduled, completed in rows:
+        for offset in range(31):
+            bit = 1 << offset
+            if scheduled & bit:
+                day = month_start + timedelta(days=offset)
+                total, done = counts.get(day, (0, 0))
+                counts[day] = (total + 1, done + (1 if completed & bit else 0))
+
+    return counts
+
+
+def archived_task_stats(db: Session, window_start: date | None = None) -> dict[int, dict]:
+    """
+    Per-template totals and completed-occurrence runs over the archive,
+    read from the packed counters (one row per template per month).
+
+    :param db: Database session
+    :type db: Session
+    :param window_start: Only count totals from this day on (streaks always
+                         cover the full archive)
+    :type window_start: date | None
+    :return: Dictionary keyed by task_id with 'total', 'completed', 'best'
+             (longest run) and 'run' (run reaching the end of the archive)
+    :rtype: dict[int, dict]
+    """
+    stats: dict[int, dict] = {}
+    window_month = window_start.replace(day=1) if window_start else None
+
+    rows = db.execute(
+        select(
+            TaskArchive.task_id,
+            TaskArchive.month_start,
+            TaskArchive.scheduled,
+            TaskArchive.completed,
+            TaskArchive.total_tasks,
+            TaskArchive.completed_tasks,
+            TaskArchive.lead_run,
+            TaskArchive.tail_run,
+            TaskArchive.best_run,
+        )
+        .order_by(TaskArchive.task_id, TaskArchive.month_start)
+    )
+
+    for (task_id, month_start, scheduled, completed, total, done,
+         lead_run, tail_run, best_run) in rows:
+        s = stats.setdefault(task_id, {"total": 0, "completed": 0, "best": 0, "run": 0})
+
+        if window_month is None or month_start > window_month:
+            s["total"] += total
+            s["completed"] += done
+        elif month_start == window_month:
+            mask = ~((1 << (window_start.day - 1)) - 1)
+            s["total"] += (scheduled & mask).bit_count()
+            s["completed"] += (completed & mask).bit_count()
+
+        if done == total:
+            s["run"] += total
+        else:
+            s["best"] = max(s["best"], s["run"] + lead_run, best_run)
+            s["run"] = tail_run
+
+        s["best"] = max(s["best"], s["run"])
+
+    return stats
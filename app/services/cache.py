@@ -0,0 +1,293 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.db import engine as default_engine
+from app.database.models import DataVersion
+from app.services.date_service import get_logical_date
+
+logger = logging.getLogger("app.cache")
+
+# The shared data version lives in a single row
+STAMP_ID = 1
+
+# Seconds a process trusts its data version before re-reading the shared
+# stamp; writes from other processes show up within this delay
+DATA_VERSION_TTL = 1.0
+
+# Set while a VersionRefresher keeps the versions current
+_refresher_running = False
+
+
+class VersionedCache:
+    """
+    In-process cache for derived read models (dashboard, progress).
+
+    Entries are keyed by the logical date and a data-version counter.
+    Write paths bump the version, and every entry is evicted when the
+    logical day rolls over at DAY_RESET_HOUR.
+
+    With a version_source, the version follows a shared counter: it is
+    re-read at most every `ttl` seconds, and a change made by another
+    process evicts the entries just like a local bump. In the server a
+    VersionRefresher re-reads it in the background instead, so lookups
+    never query the database.
+    """
+
+    def __init__(self, version_source: Callable[[], int | None] | None = None,
+                 ttl: float = DATA_VERSION_TTL):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, Any] = {}
+        self._day = None
+        self._version = 0
+        self._version_source = version_source
+        self._ttl = ttl
+        self._checked = float("-inf")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def version(self) -> int:
+        self._refresh()
+        return self._version
+
+    def bump(self, version: int | None = None) -> int:
+        """
+        Invalidate every cached entry by moving to a new data version.
+
+        :param version: The new version (defaults to the current one + 1)
+        :type version: int | None
+        :return: The new data version
+        :rtype: int
+        """
+        with self._lock:
+            self._version = self._version + 1 if version is None else version
+            self._checked = time.monotonic()
+            self.evictions += len(self._entries)
+            self._entries.clear()
+            return self._version
+
+    def _refresh(self):
+        """Follow the shared version once the TTL has passed."""
+        if (
+            self._version_source is None
+            or _refresher_running
+            or time.monotonic() - self._checked < self._ttl
+        ):
+            return
+
+        self.refresh()
+
+    def refresh(self):
+        """
+        Re-read the shared version now, evicting the entries if another
+        process changed it. Blocking: it queries the database.
+        """
+        if self._version_source is None:
+            return
+
+        version = self._version_source()
+
+        with self._lock:
+            self._checked = time.monotonic()
+            if version is None or version == self._version:
+                return
+
+        self.bump(version)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        :param key: Cache key, unique per read model and its arguments
+        :type key: Hashable
+        :param compute: Callable producing the value on a miss
+        :type compute: Callable[[], Any]
+        :return: The cached or freshly computed value
+        :rtype: Any
+        """
+        today = get_logical_date()
+        self._refresh()
+
+        with self._lock:
+            if self._day != today:
+                self.evictions += len(self._entries)
+                self._entries.clear()
+                self._day = today
+
+            full_key = (today, self._version, key)
+            if full_key in self._entries:
+                self.hits += 1
+                return self._entries[full_key]
+
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            # Drop the value if a write landed while it was being computed
+            if self._day == today and self._version == full_key[1]:
+                self._entries[full_key] = value
+
+        return value
+
+    def clear(self):
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._day = None
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss statistics for the cache.
+
+        :return: Dictionary with 'hits', 'misses', 'evictions', 'entries',
+                 'hit_ratio', 'version' and 'day' keys
+        :rtype: dict
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "version": self._version,
+                "day": self._day.isoformat() if self._day else None,
+            }
+
+
+class VersionRefresher:
+    """
+    Background task re-reading the shared data version of every cache
+    each DATA_VERSION_TTL seconds on a worker thread. While it runs,
+    caches do not re-read it themselves, so requests (ETag checks
+    included) never wait on SQLite for it on the event loop.
+    """
+
+    def __init__(self, caches: Callable[[], list[VersionedCache]], interval: float = DATA_VERSION_TTL):
+        self._caches = caches
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start the loop on the running event loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="version-refresher")
+
+    async def stop(self):
+        global _refresher_running
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        _refresher_running = False
+
+    async def _run(self):
+        global _refresher_running
+
+        while True:
+            await asyncio.to_thread(self.refresh_all)
+            # Only after the first pass, so the versions are never staler than before
+            _refresher_running = True
+            await asyncio.sleep(self._interval)
+
+    def refresh_all(self):
+        """Re-read the version of every cache (blocking)."""
+        for cache in self._caches():
+            try:
+                cache.refresh()
+            except Exception:
+                logger.exception("could not read the data version")
+
+
+def read_data_version(engine: Engine | None = None) -> int | None:
+    """
+    Returns the shared data version stored in a database, or None before
+    the schema exists.
+
+    :param engine: Engine of the database (defaults to the default profile's)
+    :type engine: Engine | None
+    :return: The stored data version
+    :rtype: int | None
+    """
+    try:
+        with (engine or default_engine).connect() as connection:
+            return connection.execute(
+                select(DataVersion.version).where(DataVersion.id == STAMP_ID)
+            ).scalar() or 0
+    except OperationalError:
+        return None
+
+
+# Cache of the default profile; every other profile's sessions carry their
+# own in Session.info (see app.database.shards)
+dashboard_cache = VersionedCache(version_source=read_data_version)
+
+
+def cache_for(db: Session | AsyncSession) -> VersionedCache:
+    """
+    Returns the read cache of the profile a session belongs to.
+
+    :param db: Database session
+    :type db: Session | AsyncSession
+    :return: The profile's cache
+    :rtype: VersionedCache
+    """
+    return db.info.get("cache", dashboard_cache)
+
+
+def bump_data_version(db: Session) -> int:
+    """
+    Record that task data changed. Call after the write is committed.
+
+    The shared version is incremented in its own short transaction, after
+    the data, so another process never sees the new version before the
+    rows it stands for.
+
+    :param db: Database session
+    :type db: Session
+    :return: The new data version
+    :rtype: int
+    """
+    stmt = insert(DataVersion).values(id=STAMP_ID, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"], set_={"version": DataVersion.version + 1}
+    ).returning(DataVersion.version)
+
+    version = db.execute(stmt).scalar_one()
+    db.commit()
+
+    return cache_for(db).bump(version)
+
+
+def get_data_version(db: Session | AsyncSession) -> int:
+    """
+    Returns the current data version of the session's profile, as shared
+    by all processes.
+
+    :param db: Database session
+    :type db: Session | AsyncSession
+    :return: The current data version
+    :rtype: int
+    """
+    return cache_for(db).version
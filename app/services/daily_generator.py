@@ -1,8 +1,99 @@
-from datetime import date
+import asyncio
+import threading
+from datetime import date, timedelta
+from sqlalchemy import select, literal, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.config import settings, DEFAULT_PROFILE
+from app.database.db import begin_immediate, sync_engine_for
 from app.database.models import TaskTemplate, DailyTask, DaySummary
 from app.services.date_service import get_logical_date
+from app.services.recurrence import due_clause
+from app.services.streaks import record_day
+from app.services.summary_service import day_series, apply_summary_delta, rebuild_day_summaries
+from app.services.rollups import close_days
+from app.services.archive import archive_cutoff, archive_months, get_archived_through
+from app.services.cache import bump_data_version
+
+# Per-process "day opened" latches: the last logical day fully generated,
+# per profile, each with its own lock so profiles open in parallel
+_opened_days: dict[str, date] = {}
+_opened_day_locks: dict[str, threading.Lock] = {}
+_latches_lock = threading.Lock()
+
+
+def _profile_of(db: Session | AsyncSession) -> str:
+    return db.info.get("profile", DEFAULT_PROFILE)
+
+
+def ensure_day_opened(db: Session) -> bool:
+    """
+    Ensures today's tasks exist, at most once per logical day per process
+    and profile.
+
+    After the first call of a logical day this is a date comparison with
+    no database access. Template writes generate today's rows themselves,
+    so the latch never hides a newly added or re-enabled template.
+
+    :param db: Database session
+    :type db: Session
+    :return: True if this call opened the day
+    :rtype: bool
+    """
+    profile = _profile_of(db)
+
+    today = get_logical_date()
+    if _opened_days.get(profile) == today:
+        return False
+
+    with _latches_lock:
+        lock = _opened_day_locks.setdefault(profile, threading.Lock())
+
+    with lock:
+        if _opened_days.get(profile) == today:
+            return False
+
+        catch_up_missed_days(db, today)
+        _opened_days[profile] = today
+
+    return True
+
+
+async def ensure_day_opened_async(db: AsyncSession) -> bool:
+    """
+    Async version of ensure_day_opened. The latch is checked before
+    touching the session, so an open day costs nothing.
+
+    Opening the day waits on the profile's threading lock, so it runs on
+    a worker thread with a sync session on the same database (and the
+    same profile and cache info): blocking the event loop there would
+    stall every request, and deadlock the ones racing to open the same day.
+    """
+    if _opened_days.get(_profile_of(db)) == get_logical_date():
+        return False
+
+    sync_engine = sync_engine_for(db.bind)
+    return await asyncio.to_thread(_open_day, sync_engine, dict(db.info))
+
+
+def _open_day(sync_engine: Engine, info: dict) -> bool:
+    """ensure_day_opened() on a new session of the engine."""
+    with Session(bind=sync_engine, autoflush=False, info=info) as db:
+        return ensure_day_opened(db)
+
+
+def get_opened_day(profile: str = DEFAULT_PROFILE) -> date | None:
+    """Returns the last logical day this process has fully generated for a profile."""
+    return _opened_days.get(profile)
+
+
+def reset_day_latch():
+    """Forget the opened days so the next ensure_day_opened() regenerates."""
+    _opened_days.clear()
+
 
 def ensure_day_exists(db: Session, target_date: date | None = None):
     """
@@ -12,94 +103,140 @@ def ensure_day_exists(db: Session, target_date: date | None = None):
     if target_date is None:
         target_date = get_logical_date()
 
-    _generate_daily_tasks(db, target_date)
-    _ensure_day_summary(db, target_date)
+    ensure_days_exist(db, target_date, target_date)
 
 
-def _generate_daily_tasks(db: Session, target_date: date):
-    """
-    Create daily task instances from active templates
-    if they do not already exist.
+def ensure_days_exist(db: Session, start: date, end: date) -> int:
     """
-    templates = (
-        db.query(TaskTemplate)
-        .filter(TaskTemplate.is_active == True)
-        .all()
-    )
+    Ensures that daily tasks and summaries exist for every logical day
+    in the inclusive range [start, end], in a single transaction.
 
-    for template in templates:
-        exists = (
-            db.query(DailyTask)
-            .filter(
-                DailyTask.task_id == template.id,
-                DailyTask.task_date == target_date
-            )
-            .first()
-        )
+    Used to backfill the days that were missed while the machine was off.
+    The transaction holds SQLite's write lock from the start, so server
+    processes opening the same day run one after the other; the later ones
+    find the rows in place and create nothing.
+
+    :param db: Database session
+    :type db: Session
+    :param start: First logical day to generate
+    :type start: date
+    :param end: Last logical day to generate
+    :type end: date
+    :return: Number of daily task rows created
+    :rtype: int
+    """
+    if start > end:
+        return 0
 
-        if exists:
-            continue
+    begin_immediate(db)
+    created = _generate_daily_tasks(db, start, end)
 
-        daily_task = DailyTask(
-            task_id=template.id,
-            task_date=target_date,
-            completed=False,
-            completed_at=None
-        )
-        db.add(daily_task)
+    if start == end and db.get(DaySummary, start) is not None:
+        # Steady state: adjust the existing counters in O(1)
+        apply_summary_delta(db, start, total_delta=created)
+    else:
+        rebuild_day_summaries(db, start, end)
+        _advance_streaks(db, start, end)
 
     db.commit()
-    
 
-def _ensure_day_summary(db: Session, target_date: date):
+    if created:
+        bump_data_version(db)
+
+    return created
+
+
+def catch_up_missed_days(db: Session, today: date | None = None) -> int:
     """
-    Ensure that a DaySummary entry exists for the target date.
+    Backfill every logical day between the last generated day and today,
+    then fold the days that closed into the weekly/monthly rollups and,
+    when archive_keep_months is set, archive the months that aged out.
 
     :param db: Database session
     :type db: Session
-    :param target_date: The date for which to ensure the summary
-    :type target_date: date
+    :param today: The current logical day (defaults to get_logical_date())
+    :type today: date | None
+    :return: Number of daily task rows created
+    :rtype: int
     """
-    total_tasks = (
-        db.query(DailyTask)
-        .filter(DailyTask.task_date == target_date)
-        .count()
-    )
+    if today is None:
+        today = get_logical_date()
+
+    # Read the last generated day under the write lock, so a process that
+    # waited for another one's catch-up continues where it stopped
+    begin_immediate(db)
+    last_day = db.query(func.max(DaySummary.date)).scalar()
+
+    start = today
+    if last_day is not None and last_day < today:
+        start = last_day + timedelta(days=1)
+
+    created = ensure_days_exist(db, start, today)
+
+    begin_immediate(db)
+    if close_days(db, today - timedelta(days=1)):
+        db.commit()
+    else:
+        db.rollback()
+
+    if settings.archive_keep_months:
+        begin_immediate(db)
+        cutoff = archive_cutoff(db, settings.archive_keep_months, today)
+        archived_through = get_archived_through(db)
+        if cutoff is not None and (archived_through is None or cutoff > archived_through):
+            archive_months(db, cutoff)
+            db.commit()
+            bump_data_version(db)
+        else:
+            db.rollback()
+
+    return created
+
 
-    completed_tasks = (
-        db.query(DailyTask)
-        .filter(
-            DailyTask.task_date == target_date,
-            DailyTask.completed == True
+def _generate_daily_tasks(db: Session, start: date, end: date) -> int:
+    """
+    Create daily task instances from active templates for every day
+    in the range with one INSERT ... SELECT, keeping only the (template,
+    day) pairs the template's recurrence rule makes due. Existing
+    (task_id, task_date) pairs are skipped through the uq_task_day constraint.
+    """
+    days = day_series(start, end)
+
+    rows = (
+        select(
+            TaskTemplate.id,
+            days.c.day,
+            literal(False),
         )
-        .count()
+        .select_from(TaskTemplate)
+        .join(days, literal(True))
+        .where(TaskTemplate.is_active == True)
+        .where(due_clause(days.c.day))
     )
 
-    completion_pct = (
-        (completed_tasks / total_tasks) * 100
-        if total_tasks > 0 else 0.0
+    stmt = (
+        insert(DailyTask)
+        .from_select(["task_id", "task_date", "completed"], rows)
+        .on_conflict_do_nothing(index_elements=["task_id", "task_date"])
     )
 
-    summary = (
-        db.query(DaySummary)
-        .filter(DaySummary.date == target_date)
-        .first()
-    )
+    db.execute(stmt)
 
-    if summary:
-        summary.total_tasks = total_tasks
-        summary.completed_tasks = completed_tasks
-        summary.completion_pct = completion_pct
-        db.commit()
-        return
+    # The CTE is rendered ahead of INSERT, so the DB-API rowcount is not
+    # reported; ask SQLite directly how many rows the insert created.
+    return db.execute(select(func.changes())).scalar()
 
-    summary = DaySummary(
-        date=target_date,
-        total_tasks=total_tasks,
-        completed_tasks=completed_tasks,
-        completion_pct=completion_pct
-    )
 
-    db.add(summary)
-    db.commit()
+def _advance_streaks(db: Session, start: date, end: date):
+    """
+    Feed the rebuilt summaries to the streak projection in date order.
+    """
+    summaries = (
+        db.query(DaySummary.date, DaySummary.completion_pct, DaySummary.total_tasks)
+        .filter(DaySummary.date >= start, DaySummary.date <= end)
+        .order_by(DaySummary.date)
+        .all()
+    )
 
+    for day, pct, total in summaries:
+        record_day(db, day, pct, rest=total == 0)
@@ -1,8 +1,16 @@
 from datetime import timedelta
+from sqlalchemy import select, func, case, and_, literal
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.database.models import DailyTask, DaySummary, TaskTemplate
 from app.services.date_service import get_logical_date
+from app.services.streaks import get_streak_state, current_streak
+from app.services.cache import cache_for
+from app.services.archive import archived_task_stats
+
+# Consistency windows offered on the dashboard (in days)
+CONSISTENCY_WINDOWS = (30, 90, 365)
 
 
 def get_today_progress(db: Session) -> dict:
@@ -14,6 +22,13 @@ def get_today_progress(db: Session) -> dict:
     :return: Dictionary with keys 'completed', 'total', and 'percent'
     :rtype: dict
     """
+    return cache_for(db).get_or_compute(
+        "progress", lambda: _compute_today_progress(db)
+    )
+
+
+def _compute_today_progress(db: Session) -> dict:
+    """Uncached body of get_today_progress."""
     today = get_logical_date()
 
     summary = (
@@ -45,24 +60,8 @@ def get_current_streak(db: Session) -> int:
     :return: Number of consecutive days with 100% completion
     :rtype: int
     """
-    today = get_logical_date()
-    streak = 0
-    cursor = today
-
-    while True:
-        summary = (
-            db.query(DaySummary)
-            .filter(DaySummary.date == cursor)
-            .first()
-        )
-
-        if not summary or summary.completion_pct < 100:
-            break
-
-        streak += 1
-        cursor -= timedelta(days=1)
-
-    return streak
+    state = get_streak_state(db)
+    return current_streak(state, get_logical_date())
 
 
 def get_best_streak(db: Session) -> int:
@@ -74,29 +73,7 @@ def get_best_streak(db: Session) -> int:
     :return: Best number of consecutive days with 100% completion
     :rtype: int
     """
-    summaries = (
-        db.query(DaySummary)
-        .order_by(DaySummary.date)
-        .all()
-    )
-
-    best = 0
-    current = 0
-    last_date = None
-
-    for s in summaries:
-        if s.completion_pct == 100:
-            if last_date and (s.date - last_date).days == 1:
-                current += 1
-            else:
-                current = 1
-            best = max(best, current)
-        else:
-            current = 0
-
-        last_date = s.date
-
-    return best
+    return get_streak_state(db).best_length
 
 
 def get_weekly_summary(db: Session, days: int = 7) -> list[dict]:
@@ -129,61 +106,178 @@ def get_weekly_summary(db: Session, days: int = 7) -> list[dict]:
     ]
 
 
-def get_task_consistency(db: Session) -> list[dict]:
+def get_task_consistency(db: Session, window_days: int | None = None) -> list[dict]:
     """
-    Calculates the consistency percentage for each task across all days.
+    Calculates the consistency percentage for each task in a single grouped
+    query, along with each task's current and best streak.
+
+    Streaks count consecutive completed occurrences of a task and always
+    cover its full history; the window only limits the consistency totals.
+    Archived months are read from their packed per-month counters and
+    joined with the live rows.
 
     :param db: Database session
     :type db: Session
-    :return: List of dictionaries with 'task' and 'percent' keys
+    :param window_days: Only count the last N days (default is all time)
+    :type window_days: int | None
+    :return: List of dictionaries with 'task', 'percent', 'total',
+             'completed', 'current_streak' and 'best_streak' keys
     :rtype: list[dict]
     """
-    results = []
+    start = None
+    in_window = literal(True)
+    if window_days is not None:
+        start = get_logical_date() - timedelta(days=window_days - 1)
+        in_window = DailyTask.task_date >= start
+
+    totals = (
+        select(
+            DailyTask.task_id,
+            func.sum(case((in_window, 1), else_=0)).label("total"),
+            func.sum(
+                case((and_(in_window, DailyTask.completed == True), 1), else_=0)
+            ).label("completed"),
+            func.count().label("rows"),
+        )
+        .group_by(DailyTask.task_id)
+        .cte("totals")
+    )
 
-    tasks = db.query(TaskTemplate).all()
+    # Gaps-and-islands: consecutive completed rows share the same offset
+    # between their position among all rows and among completed rows.
+    position = func.row_number().over(
+        partition_by=DailyTask.task_id,
+        order_by=DailyTask.task_date,
+    )
+    ranked = (
+        select(
+            DailyTask.task_id,
+            DailyTask.completed,
+            position.label("position"),
+            (
+                position
+                - func.row_number().over(
+                    partition_by=(DailyTask.task_id, DailyTask.completed),
+                    order_by=DailyTask.task_date,
+                )
+            ).label("island"),
+            func.row_number().over(
+                partition_by=DailyTask.task_id,
+                order_by=DailyTask.task_date.desc(),
+            ).label("recency"),
+        )
+        .cte("ranked")
+    )
 
-    for task in tasks:
-        total_days = (
-            db.query(DailyTask)
-            .filter(DailyTask.task_id == task.id)
-            .count()
+    runs = (
+        select(
+            ranked.c.task_id,
+            func.count().label("length"),
+            func.min(ranked.c.position).label("position"),
+            func.min(ranked.c.recency).label("recency"),
         )
+        .where(ranked.c.completed == True)
+        .group_by(ranked.c.task_id, ranked.c.island)
+        .cte("runs")
+    )
 
-        if total_days == 0:
-            continue
+    streaks = (
+        select(
+            runs.c.task_id,
+            func.max(runs.c.length).label("best"),
+            func.max(
+                case((runs.c.recency == 1, runs.c.length), else_=0)
+            ).label("current"),
+            func.max(
+                case((runs.c.position == 1, runs.c.length), else_=0)
+            ).label("leading"),
+        )
+        .group_by(runs.c.task_id)
+        .cte("streaks")
+    )
 
-        completed_days = (
-            db.query(DailyTask)
-            .filter(
-                DailyTask.task_id == task.id,
-                DailyTask.completed == True
+    live = {
+        task_id: (total, completed, rows, current, best, leading)
+        for task_id, total, completed, rows, current, best, leading in db.execute(
+            select(
+                totals.c.task_id,
+                totals.c.total,
+                totals.c.completed,
+                totals.c.rows,
+                func.coalesce(streaks.c.current, 0),
+                func.coalesce(streaks.c.best, 0),
+                func.coalesce(streaks.c.leading, 0),
             )
-            .count()
+            .outerjoin(streaks, streaks.c.task_id == totals.c.task_id)
         )
+    }
+
+    archived = archived_task_stats(db, start)
+
+    consistency = []
+    for task_id, name in db.query(TaskTemplate.id, TaskTemplate.name).order_by(TaskTemplate.id):
+        total, completed, rows, current, best, leading = live.get(task_id, (0, 0, 0, 0, 0, 0))
 
-        percent = (completed_days / total_days) * 100
+        if task_id in archived:
+            old = archived[task_id]
+            total += old["total"]
+            completed += old["completed"]
 
-        results.append({
-            "task": task.name,
-            "percent": round(percent, 1)
+            # The archive's trailing run continues into the live rows
+            best = max(best, old["best"], old["run"] + leading)
+            if current == rows:
+                current += old["run"]
+
+        if total == 0:
+            continue
+
+        consistency.append({
+            "task": name,
+            "percent": round((completed / total) * 100, 1),
+            "total": total,
+            "completed": completed,
+            "current_streak": current,
+            "best_streak": best,
         })
 
-    return results
+    return consistency
 
 
-def get_dashboard_data(db: Session) -> dict:
+def get_dashboard_data(db: Session, window_days: int | None = None) -> dict:
     """
     Aggregates all dashboard data into a single dictionary.
 
     :param db: Database session
     :type db: Session
+    :param window_days: Consistency window in days (default is all time)
+    :type window_days: int | None
     :return: Dictionary containing all dashboard metrics
     :rtype: dict
     """
+    return cache_for(db).get_or_compute(
+        ("dashboard", window_days),
+        lambda: _compute_dashboard_data(db, window_days)
+    )
+
+
+def _compute_dashboard_data(db: Session, window_days: int | None) -> dict:
+    """Uncached body of get_dashboard_data."""
     return {
         "current_streak": get_current_streak(db),
         "best_streak": get_best_streak(db),
         "weekly": get_weekly_summary(db),
-        "task_consistency": get_task_consistency(db)
+        "task_consistency": get_task_consistency(db, window_days),
+        "window_days": window_days
     }
 
+
+# --- Async versions (run the sync logic on the async session's connection) ---
+
+async def get_today_progress_async(db: AsyncSession) -> dict:
+    """Async version of get_today_progress."""
+    return await db.run_sync(get_today_progress)
+
+
+async def get_dashboard_data_async(db: AsyncSession, window_days: int | None = None) -> dict:
+    """Async version of get_dashboard_data."""
+    return await db.run_sync(get_dashboard_data, window_days)
@@ -35,3 +35,17 @@ def is_today(task_date: date) -> bool:
     Checks whether a given date is the current logical day.
     """
     return task_date == get_logical_date()
+
+
+def get_next_reset(now: datetime | None = None) -> datetime:
+    """
+    Returns the next DAY_RESET_HOUR boundary, when the logical day changes.
+    """
+    if now is None:
+        now = get_now()
+
+    reset = now.replace(hour=DAY_RESET_HOUR, minute=0, second=0, microsecond=0)
+    if reset <= now:
+        reset += timedelta(days=1)
+
+    return reset
@@ -0,0 +1,151 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from itertools import islice
+from typing import Iterable, Iterator
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.models import DailyTask, DaySummary, TaskTemplate
+from app.services.archive import iter_archived_tasks
+
+EXPORT_TABLES = ("daily_tasks", "day_summary")
+EXPORT_FORMATS = ("csv", "ndjson")
+
+# Rows fetched from the cursor (and written out) per chunk
+EXPORT_BATCH_SIZE = 1000
+
+DAILY_TASK_COLUMNS = ("task_date", "task_id", "task", "completed", "completed_at")
+DAY_SUMMARY_COLUMNS = ("date", "total_tasks", "completed_tasks", "completion_pct")
+
+
+def iter_export(
+    db: Session,
+    table: str,
+    fmt: str,
+    start: date | None = None,
+    end: date | None = None,
+) -> Iterator[str]:
+    """
+    Stream a table as CSV or NDJSON text chunks in date order.
+
+    Rows are fetched from the cursor EXPORT_BATCH_SIZE at a time and each
+    batch is emitted as one chunk, so memory stays flat whatever the size
+    of the history. Archived daily tasks are expanded ahead of the live
+    rows (archived months always precede them).
+
+    :param db: Database session (kept open while the iterator is consumed)
+    :type db: Session
+    :param table: "daily_tasks" or "day_summary"
+    :type table: str
+    :param fmt: "csv" or "ndjson"
+    :type fmt: str
+    :param start: First day to export (inclusive)
+    :type start: date | None
+    :param end: Last day to export (inclusive)
+    :type end: date | None
+    :return: Iterator of text chunks
+    :rtype: Iterator[str]
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table: {table}")
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    if table == "daily_tasks":
+        columns = DAILY_TASK_COLUMNS
+        day = DailyTask.task_date
+        stmt = (
+            select(
+                DailyTask.task_date,
+                DailyTask.task_id,
+                TaskTemplate.name,
+                DailyTask.completed,
+                DailyTask.completed_at,
+            )
+            .join(TaskTemplate, DailyTask.task_id == TaskTemplate.id)
+            .order_by(DailyTask.task_date, DailyTask.task_id)
+        )
+    else:
+        columns = DAY_SUMMARY_COLUMNS
+        day = DaySummary.date
+        stmt = (
+            select(
+                DaySummary.date,
+                DaySummary.total_tasks,
+                DaySummary.completed_tasks,
+                DaySummary.completion_pct,
+            )
+            .order_by(DaySummary.date)
+        )
+
+    if start is not None:
+        stmt = stmt.where(day >= start)
+    if end is not None:
+        stmt = stmt.where(day <= end)
+
+    encode = _csv_chunk if fmt == "csv" else _ndjson_chunk
+
+    if fmt == "csv":
+        yield _csv_chunk([columns], columns)
+
+    if table == "daily_tasks":
+        names = dict(db.query(TaskTemplate.id, TaskTemplate.name).all())
+        archived = (
+            (task_date, task_id, names.get(task_id), completed, completed_at)
+            for task_date, task_id, completed, completed_at in iter_archived_tasks(db, start, end)
+        )
+        while batch := list(islice(archived, EXPORT_BATCH_SIZE)):
+            yield encode([_serialize(row, fmt) for row in batch], columns)
+
+    result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+    for partition in result.partitions():
+        yield encode([_serialize(row, fmt) for row in partition], columns)
+
+
+def _serialize(row, fmt: str) -> tuple:
+    """Convert one row to CSV/JSON friendly values."""
+    values = []
+    for value in row:
+        if isinstance(value, date):
+            value = value.isoformat()
+        elif isinstance(value, bool) and fmt == "csv":
+            value = int(value)
+        values.append(value)
+    return tuple(values)
+
+
+def _csv_chunk(rows: list, columns: tuple) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(rows: list, columns: tuple) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Gzip a stream of text chunks incrementally.
+
+    :param chunks: Text chunks
+    :type chunks: Iterable[str]
+    :return: Iterator of gzip-compressed byte chunks
+    :rtype: Iterator[bytes]
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+
+    yield compressor.flush()
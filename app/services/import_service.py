@@ -0,0 +1,235 @@
+import csv
+import gzip
+import json
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.database.models import TaskTemplate, DailyTask
+from app.services.date_service import get_logical_date
+from app.services.summary_service import rebuild_day_summaries
+from app.services.streaks import rebuild_streaks
+from app.services.rollups import rebuild_rollups
+from app.services.archive import get_archived_through, archive_months, archived_schedules
+from app.services.cache import bump_data_version
+
+# Records sent to the database per executemany
+IMPORT_BATCH_SIZE = 5000
+
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+
+
+def read_records(path: str | Path) -> Iterator[dict]:
+    """
+    Read history records from a CSV or NDJSON file (optionally gzipped),
+    in the layout written by `todo export daily_tasks`.
+
+    Each record needs 'task' (the template name) and 'task_date'; 'completed'
+    and 'completed_at' are optional. Any 'task_id' column is ignored, since
+    ids differ between databases.
+
+    :param path: File ending in .csv or .ndjson/.jsonl, plus an optional .gz
+    :type path: str | Path
+    :return: Iterator of normalized records with 'task', 'task_date',
+             'completed' and 'completed_at' keys
+    :rtype: Iterator[dict]
+    """
+    path = Path(path)
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+
+    compressed = suffixes[-1:] == [".gz"]
+    if compressed:
+        suffixes.pop()
+
+    fmt = suffixes[-1] if suffixes else ""
+
+    if fmt not in {".csv", ".ndjson", ".jsonl"}:
+        raise ValueError(f"Unsupported import file: {path.name}")
+
+    opener = gzip.open if compressed else open
+
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        if fmt == ".csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for line_no, row in enumerate(rows, start=1):
+            yield _normalize(row, line_no)
+
+
+def _normalize(row: dict, line_no: int) -> dict:
+    """Validate one raw record and convert its values."""
+    name = str(row.get("task") or row.get("name") or "").strip()
+    task_date = row.get("task_date") or row.get("date")
+
+    if not name or not task_date:
+        raise ValueError(f"Record {line_no}: 'task' and 'task_date' are required")
+
+    completed = row.get("completed")
+    if not isinstance(completed, bool):
+        completed = str(completed or "").strip().lower() in TRUE_VALUES
+
+    completed_at = row.get("completed_at") or None
+
+    try:
+        return {
+            "task": name,
+            "task_date": date.fromisoformat(str(task_date)[:10]),
+            "completed": completed,
+            "completed_at": (
+                datetime.fromisoformat(completed_at) if completed and completed_at else None
+            ),
+        }
+    except ValueError as e:
+        raise ValueError(f"Record {line_no}: {e}") from None
+
+
+def import_history(
+    db: Session,
+    records: Iterable[dict],
+    progress: Callable[[int, int], None] | None = None,
+) -> dict:
+    """
+    Bulk-load history records into task_templates and daily_tasks.
+
+    Records are inserted in batches of IMPORT_BATCH_SIZE with executemany,
+    all inside one transaction. Unknown task names become new (active)
+    templates. Rows that already exist for a (task, day) are left as they
+    are via uq_task_day, so importing the same file twice is a no-op.
+    Day summaries of the affected range, streaks and rollups are rebuilt
+    once at the end. Records dated after today are skipped.
+
+    :param db: Database session
+    :type db: Session
+    :param records: Records as produced by read_records()
+    :type records: Iterable[dict]
+    :param progress: Called after every batch with (records read, rows inserted)
+    :type progress: Callable[[int, int], None] | None
+    :return: Dictionary with 'records', 'inserted', 'skipped', 'templates',
+             'start' and 'end' keys
+    :rtype: dict
+    """
+    today = get_logical_date()
+    template_ids = dict(db.query(TaskTemplate.name, TaskTemplate.id).all())
+    archived_through = get_archived_through(db)
+
+    stats = {
+        "records": 0, "inserted": 0, "skipped": 0, "templates": 0,
+        "start": None, "end": None,
+    }
+
+    try:
+        records = iter(records)
+        while batch := list(islice(records, IMPORT_BATCH_SIZE)):
+            stats["records"] += len(batch)
+
+            rows = [record for record in batch if record["task_date"] <= today]
+            stats["skipped"] += len(batch) - len(rows)
+
+            if rows:
+                stats["templates"] += _ensure_templates(
+                    db, {row["task"] for row in rows}, template_ids
+                )
+
+            if rows and archived_through is not None:
+                rows = _drop_archived(db, rows, template_ids, archived_through)
+
+            if rows:
+                stats["inserted"] += _insert_tasks(db, rows, template_ids)
+
+                first = min(row["task_date"] for row in rows)
+                last = max(row["task_date"] for row in rows)
+                stats["start"] = min(stats["start"] or first, first)
+                stats["end"] = max(stats["end"] or last, last)
+
+            if progress:
+                progress(stats["records"], stats["inserted"])
+
+        if stats["inserted"]:
+            # Rows landing in archived months join the archive before the
+            # summaries are recounted
+            if archived_through is not None and stats["start"] <= archived_through:
+                archive_months(db, archived_through)
+
+            rebuild_day_summaries(db, stats["start"], stats["end"])
+            rebuild_streaks(db)
+            rebuild_rollups(db)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if stats["inserted"] or stats["templates"]:
+        bump_data_version(db)
+
+    return stats
+
+
+def _insert_tasks(db: Session, rows: list[dict], template_ids: dict) -> int:
+    """Insert one batch of task rows with executemany; returns rows created."""
+    # Core executemany on the session's connection: the rowcount only
+    # counts rows that did not already exist
+    result = db.connection().execute(
+        insert(DailyTask).on_conflict_do_nothing(
+            index_elements=["task_id", "task_date"]
+        ),
+        [
+            {
+                "task_id": template_ids[row["task"]],
+                "task_date": row["task_date"],
+                "completed": row["completed"],
+                "completed_at": row["completed_at"],
+            }
+            for row in rows
+        ],
+    )
+    return result.rowcount
+
+
+def _ensure_templates(db: Session, names: set[str], template_ids: dict) -> int:
+    """
+    Create the templates among `names` that do not exist yet and add
+    their ids to `template_ids`. Returns how many were created.
+    """
+    missing = sorted(names - template_ids.keys())
+
+    if not missing:
+        return 0
+
+    now = datetime.utcnow()
+    db.connection().execute(
+        insert(TaskTemplate).on_conflict_do_nothing(index_elements=["name"]),
+        [{"name": name, "is_active": True, "created_at": now} for name in missing],
+    )
+
+    template_ids.update(
+        db.execute(
+            select(TaskTemplate.name, TaskTemplate.id)
+            .where(TaskTemplate.name.in_(missing))
+        ).all()
+    )
+
+    return len(missing)
+
+
+def _drop_archived(db: Session, rows: list[dict], template_ids: dict, archived_through: date) -> list[dict]:
+    """Leave out records whose (task, day) already exists in the archive."""
+    keys = {
+        (row["task_date"].replace(day=1), template_ids[row["task"]])
+        for row in rows
+        if row["task_date"] <= archived_through
+    }
+    schedules = archived_schedules(db, keys)
+
+    return [
+        row for row in rows
+        if not schedules.get(
+            (row["task_date"].replace(day=1), template_ids[row["task"]]), 0
+        ) & (1 << (row["task_date"].day - 1))
+    ]
@@ -0,0 +1,153 @@
+import calendar
+from datetime import date, timedelta
+from sqlalchemy import and_, or_, cast, func, Integer
+
+from app.database.models import TaskTemplate
+
+# Weekday names in bit order (bit 0 = Monday, as date.weekday())
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+ALL_WEEKDAYS = (1 << len(WEEKDAYS)) - 1
+
+# How far ahead next_due() looks (a monthly rule on the 31st recurs within this)
+MAX_LOOKAHEAD_DAYS = 400
+
+
+def weekday_mask(names: list[str]) -> int | None:
+    """
+    Build a weekday bitmask from day names ('mon' ... 'sun').
+
+    :param names: Weekday names, case-insensitive, at least their first three letters
+    :type names: list[str]
+    :return: The mask, or None for all seven days (every day)
+    :rtype: int | None
+    :raises ValueError: No or an unknown day name
+    """
+    if not names:
+        raise ValueError("Choose at least one weekday")
+
+    mask = 0
+    for name in names:
+        key = name.strip().lower()[:3]
+        if key not in WEEKDAYS:
+            raise ValueError(f"Unknown weekday: {name}")
+        mask |= 1 << WEEKDAYS.index(key)
+
+    return mask if mask != ALL_WEEKDAYS else None
+
+
+def validate_rule(
+    weekday_mask: int | None = None,
+    interval_days: int | None = None,
+    month_day: int | None = None,
+):
+    """
+    Reject recurrence values that could never (or always) be due.
+
+    :raises ValueError: A value is out of range
+    """
+    if weekday_mask is not None and not 0 < weekday_mask <= ALL_WEEKDAYS:
+        raise ValueError("Choose at least one weekday")
+
+    if interval_days is not None and interval_days < 1:
+        raise ValueError("Repeat interval must be at least 1 day")
+
+    if month_day is not None and not 1 <= month_day <= 31:
+        raise ValueError("Day of month must be between 1 and 31")
+
+
+def due_clause(day_column):
+    """
+    SQL expression: whether TaskTemplate is due on `day_column` (an ISO
+    date string column, such as day_series().c.day).
+
+    Evaluated inside the INSERT ... SELECT that generates daily tasks, so
+    the schedule of every template over a whole date range is expanded by
+    SQLite in one statement.
+    """
+    weekday = (cast(func.strftime("%w", day_column), Integer) + 6) % 7
+    day_of_month = cast(func.strftime("%d", day_column), Integer)
+    last_of_month = cast(
+        func.strftime("%d", day_column, "start of month", "+1 month", "-1 day"), Integer
+    )
+    days_since_anchor = cast(
+        func.julianday(day_column) - func.julianday(TaskTemplate.anchor_date), Integer
+    )
+
+    return and_(
+        or_(
+            TaskTemplate.weekday_mask == None,
+            TaskTemplate.weekday_mask.op(">>")(weekday).op("&")(1) == 1,
+        ),
+        or_(
+            TaskTemplate.interval_days == None,
+            and_(
+                days_since_anchor >= 0,
+                days_since_anchor % TaskTemplate.interval_days == 0,
+            ),
+        ),
+        or_(
+            TaskTemplate.month_day == None,
+            day_of_month == func.min(TaskTemplate.month_day, last_of_month),
+        ),
+    )
+
+
+def is_due(template: TaskTemplate, day: date) -> bool:
+    """
+    Python counterpart of due_clause() for a single template and day.
+
+    :param template: The task template
+    :type template: TaskTemplate
+    :param day: The logical day
+    :type day: date
+    :return: Whether the template produces a task that day
+    :rtype: bool
+    """
+    if template.weekday_mask is not None and not template.weekday_mask >> day.weekday() & 1:
+        return False
+
+    if template.interval_days is not None:
+        anchor = template.anchor_date or day
+        if day < anchor or (day - anchor).days % template.interval_days:
+            return False
+
+    if template.month_day is not None:
+        last = calendar.monthrange(day.year, day.month)[1]
+        if day.day != min(template.month_day, last):
+            return False
+
+    return True
+
+
+def next_due(template: TaskTemplate, after: date) -> date | None:
+    """Returns the first day after `after` on which the template is due."""
+    for offset in range(1, MAX_LOOKAHEAD_DAYS + 1):
+        day = after + timedelta(days=offset)
+        if is_due(template, day):
+            return day
+
+    return None
+
+
+def describe(template: TaskTemplate) -> str:
+    """Human-readable form of a template's rule, e.g. 'Every 2 days' or 'Mon, Thu'."""
+    parts = []
+
+    if template.weekday_mask is not None:
+        parts.append(", ".join(
+            name.capitalize()
+            for bit, name in enumerate(WEEKDAYS)
+            if template.weekday_mask >> bit & 1
+        ))
+
+    if template.interval_days is not None and template.interval_days > 1:
+        parts.append(f"every {template.interval_days} days")
+
+    if template.month_day is not None:
+        parts.append(f"monthly on day {template.month_day}")
+
+    if not parts:
+        return "Every day"
+
+    text = "; ".join(parts)
+    return text[0].upper() + text[1:]
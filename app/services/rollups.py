@@ -0,0 +1,344 @@
+from datetime import date, timedelta
+from sqlalchemy import select, literal, func, case, cast, Integer
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.database.models import (
+    DailyTask,
+    DaySummary,
+    RollupState,
+    SummaryRollup,
+    TaskArchive,
+    TaskRollup,
+)
+from app.services.date_service import get_logical_date
+from app.services.archive import unpack
+
+GRANULARITIES = ("week", "month")
+
+# The state lives in a single row
+STATE_ID = 1
+
+
+def period_start(day: date, granularity: str) -> date:
+    """
+    Returns the first day of the ISO week (Monday) or month containing day.
+    """
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def _period_start_sql(column, granularity: str):
+    """SQL counterpart of period_start() for a date column."""
+    if granularity == "week":
+        # strftime('%w') is 0 for Sunday; shift so Monday starts the week
+        offset = (cast(func.strftime("%w", column), Integer) + 6) % 7
+        return func.date(column, func.printf("-%d days", offset))
+    return func.date(column, "start of month")
+
+
+def close_days(db: Session, through: date | None = None) -> int:
+    """
+    Fold every closed day up to `through` (default: yesterday) that is not
+    in the rollups yet into the weekly and monthly rollup tables.
+    The caller commits.
+
+    :param db: Database session
+    :type db: Session
+    :param through: Last closed logical day
+    :type through: date | None
+    :return: Number of days folded in
+    :rtype: int
+    """
+    if through is None:
+        through = get_logical_date() - timedelta(days=1)
+
+    state = db.get(RollupState, STATE_ID)
+    if state is None:
+        state = RollupState(id=STATE_ID, closed_through=None)
+        db.add(state)
+
+    if state.closed_through is not None:
+        start = state.closed_through + timedelta(days=1)
+    else:
+        start = db.query(func.min(DaySummary.date)).scalar()
+
+    if start is None or start > through:
+        return 0
+
+    for granularity in GRANULARITIES:
+        _fold_summaries(db, granularity, start, through)
+        _fold_tasks(db, granularity, start, through)
+
+    state.closed_through = through
+    db.flush()
+
+    return (through - start).days + 1
+
+
+def rebuild_rollups(db: Session, through: date | None = None) -> int:
+    """
+    Drop every rollup and fold all closed days again. Used for repair.
+    The caller commits.
+
+    :param db: Database session
+    :type db: Session
+    :param through: Last closed logical day (default: yesterday)
+    :type through: date | None
+    :return: Number of days folded in
+    :rtype: int
+    """
+    db.query(SummaryRollup).delete()
+    db.query(TaskRollup).delete()
+    db.query(RollupState).delete()
+    db.flush()
+
+    folded = close_days(db, through)
+
+    # Archived months have no daily_tasks rows left to fold
+    state = db.get(RollupState, STATE_ID)
+    _fold_archived_tasks(db, state.closed_through if state else None)
+
+    return folded
+
+
+def _fold_summaries(db: Session, granularity: str, start: date, end: date):
+    """Add the day summaries of [start, end] to the overall rollups."""
+    period = _period_start_sql(DaySummary.date, granularity)
+
+    rows = (
+        select(
+            literal(granularity),
+            period,
+            func.count(),
+            func.sum(case((DaySummary.completion_pct >= 100, 1), else_=0)),
+            func.sum(DaySummary.total_tasks),
+            func.sum(DaySummary.completed_tasks),
+        )
+        .where(DaySummary.date >= start, DaySummary.date <= end)
+        .group_by(period)
+    )
+
+    stmt = insert(SummaryRollup).from_select(
+        ["granularity", "period_start", "days", "perfect_days", "total_tasks", "completed_tasks"],
+        rows,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["granularity", "period_start"],
+        set_={
+            "days": SummaryRollup.days + stmt.excluded.days,
+            "perfect_days": SummaryRollup.perfect_days + stmt.excluded.perfect_days,
+            "total_tasks": SummaryRollup.total_tasks + stmt.excluded.total_tasks,
+            "completed_tasks": SummaryRollup.completed_tasks + stmt.excluded.completed_tasks,
+        },
+    )
+
+    db.execute(stmt)
+
+
+def _fold_tasks(db: Session, granularity: str, start: date, end: date):
+    """Add the daily tasks of [start, end] to the per-template rollups."""
+    period = _period_start_sql(DailyTask.task_date, granularity)
+
+    rows = (
+        select(
+            literal(granularity),
+            period,
+            DailyTask.task_id,
+            func.count(),
+            func.sum(case((DailyTask.completed == True, 1), else_=0)),
+        )
+        .where(DailyTask.task_date >= start, DailyTask.task_date <= end)
+        .group_by(period, DailyTask.task_id)
+    )
+
+    stmt = insert(TaskRollup).from_select(
+        ["granularity", "period_start", "task_id", "total_tasks", "completed_tasks"],
+        rows,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["granularity", "period_start", "task_id"],
+        set_={
+            "total_tasks": TaskRollup.total_tasks + stmt.excluded.total_tasks,
+            "completed_tasks": TaskRollup.completed_tasks + stmt.excluded.completed_tasks,
+        },
+    )
+
+    db.execute(stmt)
+
+
+def _fold_archived_tasks(db: Session, through: date | None):
+    """Add the archived tasks up to `through` to the per-template rollups."""
+    if through is None:
+        return
+
+    counts: dict[tuple, list[int]] = {}
+
+    archived = db.scalars(
+        select(TaskArchive).where(TaskArchive.month_start <= through)
+    )
+    for row in archived:
+        for day, done, _ in unpack(row):
+            if day > through:
+                continue
+            for granularity in GRANULARITIES:
+                key = (granularity, period_start(day, granularity), row.task_id)
+                total_completed = counts.setdefault(key, [0, 0])
+                total_completed[0] += 1
+                total_completed[1] += 1 if done else 0
+
+    if not counts:
+        return
+
+    stmt = insert(TaskRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["granularity", "period_start", "task_id"],
+        set_={
+            "total_tasks": TaskRollup.total_tasks + stmt.excluded.total_tasks,
+            "completed_tasks": TaskRollup.completed_tasks + stmt.excluded.completed_tasks,
+        },
+    )
+    db.connection().execute(stmt, [
+        {
+            "granularity": granularity,
+            "period_start": key_start,
+            "task_id": task_id,
+            "total_tasks": total,
+            "completed_tasks": completed,
+        }
+        for (granularity, key_start, task_id), (total, completed) in counts.items()
+    ])
+
+
+def get_history(
+    db: Session,
+    granularity: str,
+    start: date,
+    end: date,
+    task_id: int | None = None,
+) -> list[dict]:
+    """
+    Returns completion history per week or month for every period that
+    overlaps [start, end], read from the rollups. Days that are not closed
+    yet (normally just today) are added from the live tables.
+
+    :param db: Database session
+    :type db: Session
+    :param granularity: "week" or "month"
+    :type granularity: str
+    :param start: First day of the range
+    :type start: date
+    :param end: Last day of the range
+    :type end: date
+    :param task_id: Restrict the history to one task template
+    :type task_id: int | None
+    :return: List of dictionaries with 'period_start', 'total', 'completed'
+             and 'percent' keys, plus 'days' and 'perfect_days' when not
+             restricted to one task
+    :rtype: list[dict]
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+    first = period_start(start, granularity)
+    last = period_start(end, granularity)
+
+    state = db.get(RollupState, STATE_ID)
+    closed_through = state.closed_through if state else None
+    open_from = closed_through + timedelta(days=1) if closed_through else date.min
+
+    periods: dict[date, dict] = {}
+
+    def bucket(key: date) -> dict:
+        return periods.setdefault(key, {
+            "period_start": key, "days": 0, "perfect_days": 0, "total": 0, "completed": 0
+        })
+
+    if task_id is None:
+        rollups = (
+            db.query(
+                SummaryRollup.period_start,
+                SummaryRollup.days,
+                SummaryRollup.perfect_days,
+                SummaryRollup.total_tasks,
+                SummaryRollup.completed_tasks,
+            )
+            .filter(
+                SummaryRollup.granularity == granularity,
+                SummaryRollup.period_start >= first,
+                SummaryRollup.period_start <= last,
+            )
+        )
+        for key, days, perfect_days, total, completed in rollups:
+            row = bucket(key)
+            row["days"] += days
+            row["perfect_days"] += perfect_days
+            row["total"] += total
+            row["completed"] += completed
+
+        live = (
+            db.query(
+                DaySummary.date,
+                DaySummary.total_tasks,
+                DaySummary.completed_tasks,
+                DaySummary.completion_pct,
+            )
+            .filter(DaySummary.date >= max(open_from, first))
+        )
+        for day, total, completed, pct in live:
+            key = period_start(day, granularity)
+            if key > last:
+                continue
+            row = bucket(key)
+            row["days"] += 1
+            row["perfect_days"] += 1 if pct >= 100 else 0
+            row["total"] += total
+            row["completed"] += completed
+    else:
+        rollups = (
+            db.query(
+                TaskRollup.period_start,
+                TaskRollup.total_tasks,
+                TaskRollup.completed_tasks,
+            )
+            .filter(
+                TaskRollup.granularity == granularity,
+                TaskRollup.task_id == task_id,
+                TaskRollup.period_start >= first,
+                TaskRollup.period_start <= last,
+            )
+        )
+        for key, total, completed in rollups:
+            row = bucket(key)
+            row["total"] += total
+            row["completed"] += completed
+
+        live = (
+            db.query(DailyTask.task_date, DailyTask.completed)
+            .filter(
+                DailyTask.task_id == task_id,
+                DailyTask.task_date >= max(open_from, first),
+            )
+        )
+        for day, completed in live:
+            key = period_start(day, granularity)
+            if key > last:
+                continue
+            row = bucket(key)
+            row["total"] += 1
+            row["completed"] += 1 if completed else 0
+
+    history = []
+    for key in sorted(periods):
+        row = periods[key]
+        row["percent"] = (
+            round(row["completed"] / row["total"] * 100, 2) if row["total"] else 0.0
+        )
+        if task_id is not None:
+            del row["days"], row["perfect_days"]
+        history.append(row)
+
+    return history
@@ -0,0 +1,193 @@
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+
+from app.database.models import DaySummary, StreakState
+
+# The projection lives in a single row
+STATE_ID = 1
+
+
+def get_streak_state(db: Session) -> StreakState:
+    """
+    Returns the persisted streak projection, rebuilding it on first use.
+
+    :param db: Database session
+    :type db: Session
+    :return: The streak state row
+    :rtype: StreakState
+    """
+    state = db.get(StreakState, STATE_ID)
+
+    if state is None:
+        state = rebuild_streaks(db)
+        db.commit()
+
+    return state
+
+
+def record_day(
+    db: Session,
+    day: date,
+    completion_pct: float,
+    rest: bool = False,
+    was_perfect: bool | None = None,
+) -> StreakState:
+    """
+    Update the streak projection after a day's summary changed.
+
+    Extending or starting a run is O(1), and so is a change to the run's
+    last day (e.g. today's task undone) when the caller says whether the
+    day was perfect before. Other changes that can shrink a run (edits
+    inside or before it, or shrinking the run that holds the best length)
+    fall back to a full rebuild. A rest day (no task due) carries the run
+    over without counting towards it. The caller commits.
+
+    :param db: Database session
+    :type db: Session
+    :param day: The logical day whose summary changed
+    :type day: date
+    :param completion_pct: The day's new completion percentage
+    :type completion_pct: float
+    :param rest: Whether the day has no tasks
+    :type rest: bool
+    :param was_perfect: Whether the day was perfect before the change (None if unknown)
+    :type was_perfect: bool | None
+    :return: The updated streak state row
+    :rtype: StreakState
+    """
+    state = db.get(StreakState, STATE_ID)
+
+    if state is None:
+        return rebuild_streaks(db)
+
+    perfect = completion_pct >= 100
+    start, end = state.current_start, state.current_end
+
+    if end is not None and day == end and was_perfect is not None:
+        return _update_last_day(db, state, day, perfect, rest, was_perfect)
+
+    if end is not None and day <= end:
+        if (perfect or rest) and day >= start:
+            return state  # already part of the current run
+        return rebuild_streaks(db)
+
+    if rest:
+        if end is not None and day == end + timedelta(days=1):
+            state.current_end = day  # bridge the run to the next due day
+        return state
+
+    if not perfect:
+        return state  # breaks nothing that has been counted yet
+
+    if end is not None and day == end + timedelta(days=1):
+        state.current_end = day
+        state.current_length += 1
+    else:
+        state.current_start = day
+        state.current_end = day
+        state.current_length = 1
+
+    state.best_length = max(state.best_length, state.current_length)
+    return state
+
+
+def _update_last_day(
+    db: Session,
+    state: StreakState,
+    day: date,
+    perfect: bool,
+    rest: bool,
+    was_perfect: bool,
+) -> StreakState:
+    """
+    The last day of the current run changed: recount it in place. If it
+    no longer belongs to the run, the run ends the day before (which is
+    part of it, runs being contiguous). Rebuilds only when the run would
+    be left empty (the previous run becomes current) or it held the best
+    length, which another run may or may not share.
+    """
+    old_length = state.current_length
+    length = old_length - was_perfect + perfect
+
+    if length < 1 or (length < old_length and state.best_length == old_length):
+        return rebuild_streaks(db)
+
+    if not (perfect or rest):
+        state.current_end = day - timedelta(days=1)
+
+    state.current_length = length
+    state.best_length = max(state.best_length, length)
+    return state
+
+
+def rebuild_streaks(db: Session) -> StreakState:
+    """
+    Recompute the streak projection from every DaySummary row.
+    Used for repair and when an incremental update is not possible.
+    The caller commits.
+
+    :param db: Database session
+    :type db: Session
+    :return: The rebuilt streak state row
+    :rtype: StreakState
+    """
+    # Pending summary changes must be visible to the query below
+    db.flush()
+
+    summaries = (
+        db.query(DaySummary.date, DaySummary.completion_pct, DaySummary.total_tasks)
+        .order_by(DaySummary.date)
+        .all()
+    )
+
+    start = end = None
+    length = best = 0
+
+    for day, pct, total in summaries:
+        if total == 0:
+            # Rest day: carries an unbroken run over to the next due day
+            if end is not None and (day - end).days == 1:
+                end = day
+            continue
+
+        if pct < 100:
+            continue
+
+        if end is not None and (day - end).days == 1:
+            length += 1
+        else:
+            start = day
+            length = 1
+
+        end = day
+        best = max(best, length)
+
+    state = db.get(StreakState, STATE_ID)
+    if state is None:
+        state = StreakState(id=STATE_ID)
+        db.add(state)
+
+    state.current_start = start
+    state.current_end = end
+    state.current_length = length
+    state.best_length = best
+
+    db.flush()
+    return state
+
+
+def current_streak(state: StreakState, today: date) -> int:
+    """
+    Returns the length of the run ending today, or 0 if today is not perfect.
+
+    :param state: The streak state row
+    :type state: StreakState
+    :param today: The current logical day
+    :type today: date
+    :return: Number of consecutive days with 100% completion
+    :rtype: int
+    """
+    if state.current_end != today:
+        return 0
+
+    return state.current_length
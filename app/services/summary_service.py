@@ -0,0 +1,209 @@
+from datetime import date
+from sqlalchemy import select, literal, func, case, Date
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.database.models import DailyTask, DaySummary, TaskArchive
+from app.services.streaks import record_day, rebuild_streaks
+from app.services.rollups import rebuild_rollups
+from app.services.archive import get_archived_through, archived_bit, archived_day_counts
+from app.services.cache import bump_data_version
+
+
+def day_series(start: date, end: date):
+    """
+    Recursive CTE yielding one row per day in the inclusive range.
+    Dates are rendered as ISO strings, matching SQLite's Date storage.
+    """
+    days = (
+        select(literal(start, Date).label("day"))
+        .cte("days", recursive=True)
+    )
+    return days.union_all(
+        select(func.date(days.c.day, "+1 day"))
+        .where(days.c.day < literal(end, Date))
+    )
+
+
+def apply_summary_delta(
+    db: Session,
+    day: date,
+    total_delta: int = 0,
+    completed_delta: int = 0,
+) -> float:
+    """
+    Adjust a day's summary counters in place with one atomic upsert and
+    feed the new percentage to the streak projection. Creates the summary
+    row if it does not exist yet. The caller commits.
+
+    :param db: Database session
+    :type db: Session
+    :param day: The logical day whose tasks changed
+    :type day: date
+    :param total_delta: Tasks added (positive) or removed (negative)
+    :type total_delta: int
+    :param completed_delta: Tasks completed (positive) or uncompleted (negative)
+    :type completed_delta: int
+    :return: The day's new completion percentage
+    :rtype: float
+    """
+    stmt = insert(DaySummary).values(
+        date=day,
+        total_tasks=total_delta,
+        completed_tasks=completed_delta,
+        completion_pct=(
+            completed_delta * 100.0 / total_delta if total_delta > 0 else 0.0
+        ),
+    )
+
+    total = DaySummary.total_tasks + stmt.excluded.total_tasks
+    completed = DaySummary.completed_tasks + stmt.excluded.completed_tasks
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date"],
+        set_={
+            "total_tasks": total,
+            "completed_tasks": completed,
+            "completion_pct": case((total > 0, completed * 100.0 / total), else_=0.0),
+        },
+    ).returning(DaySummary.completion_pct, DaySummary.total_tasks, DaySummary.completed_tasks)
+
+    completion_pct, total_tasks, completed_tasks = db.execute(stmt).one()
+
+    # The counters before this change tell the streak projection what the day was
+    old_total = total_tasks - total_delta
+    old_completed = completed_tasks - completed_delta
+
+    record_day(
+        db, day, completion_pct,
+        rest=total_tasks == 0,
+        was_perfect=old_total > 0 and old_completed >= old_total,
+    )
+    return completion_pct
+
+
+def rebuild_day_summaries(db: Session, start: date, end: date):
+    """
+    Recompute the DaySummary rows for every day in the range from the true
+    counts with a single grouped upsert. Days without any tasks still get
+    an empty summary, and archived days are counted from task_archive.
+    The caller commits and updates streaks.
+
+    :param db: Database session
+    :type db: Session
+    :param start: First day of the range
+    :type start: date
+    :param end: Last day of the range
+    :type end: date
+    """
+    days = day_series(start, end)
+
+    total = func.count(DailyTask.id)
+    completed = func.coalesce(
+        func.sum(case((DailyTask.completed == True, 1), else_=0)), 0
+    )
+
+    archived_through = get_archived_through(db)
+    if archived_through is not None and start <= archived_through:
+        total = total + _archived_count(TaskArchive.scheduled, days.c.day)
+        completed = completed + _archived_count(TaskArchive.completed, days.c.day)
+
+    rows = (
+        select(
+            days.c.day,
+            total,
+            completed,
+            case((total > 0, completed * 100.0 / total), else_=0.0),
+        )
+        .select_from(days)
+        .outerjoin(DailyTask, DailyTask.task_date == days.c.day)
+        .group_by(days.c.day)
+    )
+
+    stmt = insert(DaySummary).from_select(
+        ["date", "total_tasks", "completed_tasks", "completion_pct"], rows
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date"],
+        set_={
+            "total_tasks": stmt.excluded.total_tasks,
+            "completed_tasks": stmt.excluded.completed_tasks,
+            "completion_pct": stmt.excluded.completion_pct,
+        },
+    )
+
+    db.execute(stmt)
+
+
+def _archived_count(bitmap, day_column):
+    """Correlated subquery: archived tasks set in `bitmap` on a day."""
+    return (
+        select(func.coalesce(func.sum(archived_bit(bitmap, day_column)), 0))
+        .where(TaskArchive.month_start == func.date(day_column, "start of month"))
+        .scalar_subquery()
+    )
+
+
+def verify_day_summaries(db: Session, repair: bool = True) -> list[dict]:
+    """
+    Compare every DaySummary row with the true counts in daily_tasks and
+    task_archive and optionally repair the drifted days (and the streaks and rollups).
+
+    :param db: Database session
+    :type db: Session
+    :param repair: Rewrite drifted summaries from the true counts
+    :type repair: bool
+    :return: One dictionary per drifted day with 'date', 'expected_total',
+             'actual_total', 'expected_completed' and 'actual_completed'
+    :rtype: list[dict]
+    """
+    true_counts = {
+        task_date: (total, completed or 0)
+        for task_date, total, completed in db.query(
+            DailyTask.task_date,
+            func.count(DailyTask.id),
+            func.sum(case((DailyTask.completed == True, 1), else_=0)),
+        )
+        .group_by(DailyTask.task_date)
+        .all()
+    }
+
+    for day, (total, completed) in archived_day_counts(db).items():
+        live_total, live_completed = true_counts.get(day, (0, 0))
+        true_counts[day] = (live_total + total, live_completed + completed)
+
+    stored = {
+        day: (total, completed)
+        for day, total, completed in db.query(
+            DaySummary.date,
+            DaySummary.total_tasks,
+            DaySummary.completed_tasks,
+        ).all()
+    }
+
+    drift = []
+    for day in sorted(true_counts.keys() | stored.keys()):
+        expected = true_counts.get(day, (0, 0))
+        actual = stored.get(day)
+
+        if actual == expected:
+            continue
+
+        drift.append({
+            "date": day,
+            "expected_total": expected[0],
+            "actual_total": actual[0] if actual else None,
+            "expected_completed": expected[1],
+            "actual_completed": actual[1] if actual else None,
+        })
+
+    if repair and drift:
+        for item in drift:
+            rebuild_day_summaries(db, item["date"], item["date"])
+
+        rebuild_streaks(db)
+        rebuild_rollups(db)
+        db.commit()
+        bump_data_version(db)
+
+    return drift
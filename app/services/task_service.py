@@ -1,9 +1,14 @@
 from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database.models import TaskTemplate, DailyTask, DaySummary
+from app.database.models import TaskTemplate, DailyTask
 from app.services.date_service import get_logical_date, is_today
 from app.services.daily_generator import ensure_day_exists
+from app.services.summary_service import apply_summary_delta
+from app.services.cache import bump_data_version
+from app.services.recurrence import validate_rule
 
 
 def get_today_tasks(db: Session) -> list[tuple[DailyTask, str]]:
@@ -25,14 +30,54 @@ def get_today_tasks(db: Session) -> list[tuple[DailyTask, str]]:
     )
 
 
-def create_task_template(db: Session, name: str) -> TaskTemplate:
+def get_task_name(db: Session, template_id: int) -> str:
     """
-    Create a new task template and ensure it appears today.
+    Retrieve the name of a task template.
+
+    :param db: Database session
+    :type db: Session
+    :param template_id: ID of the task template
+    :type template_id: int
+    :return: The template's name
+    :rtype: str
+    """
+    return db.query(TaskTemplate.name).filter(TaskTemplate.id == template_id).scalar()
+
+
+def list_task_templates(db: Session) -> list[TaskTemplate]:
+    """
+    Retrieve every task template.
+
+    :param db: Database session
+    :type db: Session
+    :return: List of TaskTemplate objects
+    :rtype: list[TaskTemplate]
+    """
+    return db.query(TaskTemplate).all()
+
+
+def create_task_template(
+    db: Session,
+    name: str,
+    weekday_mask: int | None = None,
+    interval_days: int | None = None,
+    month_day: int | None = None,
+) -> TaskTemplate:
+    """
+    Create a new task template and ensure it appears today if it is due.
+    Without a recurrence rule the task is due every day; an interval counts
+    from today.
 
     :param db: Database session
     :type db: Session
     :param name: Name of the task template
     :type name: str
+    :param weekday_mask: Weekdays the task is due on (bit 0 = Monday)
+    :type weekday_mask: int | None
+    :param interval_days: Due every N days
+    :type interval_days: int | None
+    :param month_day: Due on this day of the month (the last day in shorter months)
+    :type month_day: int | None
     :return: The created TaskTemplate object
     :rtype: TaskTemplate
     """
@@ -41,6 +86,8 @@ def create_task_template(db: Session, name: str) -> TaskTemplate:
     if not name:
         raise ValueError("Task name cannot be empty")
 
+    validate_rule(weekday_mask, interval_days, month_day)
+
     exists = (
         db.query(TaskTemplate)
         .filter(TaskTemplate.name == name)
@@ -51,12 +98,17 @@ def create_task_template(db: Session, name: str) -> TaskTemplate:
 
     template = TaskTemplate(
         name=name,
-        is_active=True
+        is_active=True,
+        weekday_mask=weekday_mask,
+        interval_days=interval_days,
+        anchor_date=get_logical_date() if interval_days else None,
+        month_day=month_day,
     )
 
     db.add(template)
     db.commit()
     db.refresh(template)
+    bump_data_version(db)
 
     # Ensure today's daily task exists immediately
     ensure_day_exists(db)
@@ -66,7 +118,8 @@ def create_task_template(db: Session, name: str) -> TaskTemplate:
 
 def toggle_task_template(db: Session, template_id: int) -> TaskTemplate:
     """
-    Enable or disable a task template (future days only).
+    Enable or disable a task template. Disabling keeps today's task;
+    enabling makes the task appear today.
 
     :param db: Database session
     :type db: Session
@@ -82,6 +135,57 @@ def toggle_task_template(db: Session, template_id: int) -> TaskTemplate:
 
     template.is_active = not template.is_active
     db.commit()
+    bump_data_version(db)
+
+    if template.is_active:
+        ensure_day_exists(db)
+
+    return template
+
+
+def update_task_recurrence(
+    db: Session,
+    template_id: int,
+    weekday_mask: int | None = None,
+    interval_days: int | None = None,
+    month_day: int | None = None,
+) -> TaskTemplate:
+    """
+    Replace a task template's recurrence rule. Tasks already generated are
+    kept; from today on only the due days get one. A changed interval
+    restarts counting from today.
+
+    :param db: Database session
+    :type db: Session
+    :param template_id: ID of the task template
+    :type template_id: int
+    :param weekday_mask: Weekdays the task is due on (bit 0 = Monday)
+    :type weekday_mask: int | None
+    :param interval_days: Due every N days
+    :type interval_days: int | None
+    :param month_day: Due on this day of the month (the last day in shorter months)
+    :type month_day: int | None
+    :return: The updated TaskTemplate object
+    :rtype: TaskTemplate
+    """
+    validate_rule(weekday_mask, interval_days, month_day)
+
+    template = db.get(TaskTemplate, template_id)
+
+    if not template:
+        raise ValueError("Task not found")
+
+    if interval_days != template.interval_days:
+        template.anchor_date = get_logical_date() if interval_days else None
+
+    template.weekday_mask = weekday_mask
+    template.interval_days = interval_days
+    template.month_day = month_day
+    db.commit()
+    bump_data_version(db)
+
+    if template.is_active:
+        ensure_day_exists(db)
 
     return template
 
@@ -105,48 +209,149 @@ def complete_task(db: Session, daily_task_id: int) -> DailyTask:
     if not is_today(task.task_date):
         raise PermissionError("Cannot modify past or future tasks")
 
-    if task.completed:
-        return task  # idempotent
+    return _set_completed(db, task, True)
 
-    task.completed = True
-    task.completed_at = datetime.utcnow()
 
-    _update_day_summary(db, task.task_date)
+def uncomplete_task(db: Session, daily_task_id: int) -> DailyTask:
+    """
+    Mark a completed daily task as not completed (today only).
+
+    :param db: Database session
+    :type db: Session
+    :param daily_task_id: ID of the daily task to reopen
+    :type daily_task_id: int
+    :return: The updated DailyTask object
+    :rtype: DailyTask
+    """
+    task = db.query(DailyTask).get(daily_task_id)
+
+    if not task:
+        raise ValueError("Task not found")
+
+    if not is_today(task.task_date):
+        raise PermissionError("Cannot modify past or future tasks")
+
+    return _set_completed(db, task, False)
+
+
+def _set_completed(db: Session, task: DailyTask, completed: bool) -> DailyTask:
+    """
+    Flip a task's completion with a conditional UPDATE, so only the request
+    that actually changed the row adjusts the summary (idempotent, and
+    safe against double clicks racing each other).
+    """
+    result = db.execute(
+        update(DailyTask)
+        .where(DailyTask.id == task.id, DailyTask.completed == (not completed))
+        .values(completed=completed, completed_at=datetime.utcnow() if completed else None)
+        .execution_options(synchronize_session=False)
+    )
+
+    if result.rowcount != 1:
+        db.rollback()
+        db.refresh(task)
+        return task
+
+    apply_summary_delta(db, task.task_date, completed_delta=1 if completed else -1)
 
     db.commit()
+    bump_data_version(db)
+    db.refresh(task)
     return task
 
 
-def _update_day_summary(db: Session, task_date):
+def complete_tasks(db: Session, daily_task_ids: list[int]) -> int:
     """
-    Docstring for _update_day_summary
-    
-    :param db: Description
+    Mark several of today's daily tasks as completed in one transaction.
+
+    All IDs are validated first; the tasks are then marked with a single
+    UPDATE and the day's summary is adjusted once.
+
+    :param db: Database session
     :type db: Session
-    :param task_date: Description
-    :type task_date: date
+    :param daily_task_ids: IDs of the daily tasks to complete
+    :type daily_task_ids: list[int]
+    :return: Number of tasks that were newly completed
+    :rtype: int
     """
-    summary = (
-        db.query(DaySummary)
-        .filter(DaySummary.date == task_date)
-        .first()
-    )
+    ids = set(daily_task_ids)
 
-    if not summary:
-        return
+    if not ids:
+        return 0
 
-    completed = (
-        db.query(DailyTask)
-        .filter(
-            DailyTask.task_date == task_date,
-            DailyTask.completed == True
-        )
-        .count()
+    task_dates = (
+        db.query(DailyTask.task_date)
+        .filter(DailyTask.id.in_(ids))
+        .all()
     )
 
-    summary.completed_tasks = completed
-    summary.completion_pct = (
-        (completed / summary.total_tasks) * 100
-        if summary.total_tasks > 0 else 0.0
+    if len(task_dates) != len(ids):
+        raise ValueError("Task not found")
+
+    today = get_logical_date()
+    if any(task_date != today for (task_date,) in task_dates):
+        raise PermissionError("Cannot modify past or future tasks")
+
+    result = db.execute(
+        update(DailyTask)
+        .where(DailyTask.id.in_(ids), DailyTask.completed == False)
+        .values(completed=True, completed_at=datetime.utcnow())
     )
 
+    completed = result.rowcount
+    if completed:
+        apply_summary_delta(db, today, completed_delta=completed)
+
+    db.commit()
+
+    if completed:
+        bump_data_version(db)
+
+    return completed
+
+
+# --- Async versions (run the sync logic on the async session's connection) ---
+
+async def get_today_tasks_async(db: AsyncSession) -> list[tuple[DailyTask, str]]:
+    """Async version of get_today_tasks."""
+    return await db.run_sync(get_today_tasks)
+
+
+async def get_task_name_async(db: AsyncSession, template_id: int) -> str:
+    """Async version of get_task_name."""
+    return await db.run_sync(get_task_name, template_id)
+
+
+async def list_task_templates_async(db: AsyncSession) -> list[TaskTemplate]:
+    """Async version of list_task_templates."""
+    return await db.run_sync(list_task_templates)
+
+
+async def create_task_template_async(db: AsyncSession, name: str, **rule) -> TaskTemplate:
+    """Async version of create_task_template."""
+    return await db.run_sync(create_task_template, name, **rule)
+
+
+async def toggle_task_template_async(db: AsyncSession, template_id: int) -> TaskTemplate:
+    """Async version of toggle_task_template."""
+    return await db.run_sync(toggle_task_template, template_id)
+
+
+async def update_task_recurrence_async(db: AsyncSession, template_id: int, **rule) -> TaskTemplate:
+    """Async version of update_task_recurrence."""
+    return await db.run_sync(update_task_recurrence, template_id, **rule)
+
+
+async def complete_task_async(db: AsyncSession, daily_task_id: int) -> DailyTask:
+    """Async version of complete_task."""
+    return await db.run_sync(complete_task, daily_task_id)
+
+
+async def uncomplete_task_async(db: AsyncSession, daily_task_id: int) -> DailyTask:
+    """Async version of uncomplete_task."""
+    return await db.run_sync(uncomplete_task, daily_task_id)
+
+
+async def complete_tasks_async(db: AsyncSession, daily_task_ids: list[int]) -> int:
+    """Async version of complete_tasks."""
+    return await db.run_sync(complete_tasks, daily_task_ids)
@@ -0,0 +1,35 @@
+// Forms marked data-fragment are posted in the background with an
+// X-Fragment header; the server answers with just the changed elements,
+// each replacing the element with the same id. Without JavaScript (or if
+// the request fails) the form posts normally and the page reloads.
+document.addEventListener("submit", async (event) => {
+  const form = event.target;
+  if (!form.matches("form[data-fragment]")) return;
+
+  event.preventDefault();
+
+  let response;
+  try {
+    response = await fetch(form.action, {
+      method: "POST",
+      body: new FormData(form),
+      headers: { "X-Fragment": "1" },
+    });
+  } catch {
+    form.submit();
+    return;
+  }
+
+  if (!response.ok) {
+    form.submit();
+    return;
+  }
+
+  const template = document.createElement("template");
+  template.innerHTML = await response.text();
+
+  for (const fragment of Array.from(template.content.children)) {
+    const target = fragment.id && document.getElementById(fragment.id);
+    if (target) target.replaceWith(fragment);
+  }
+});
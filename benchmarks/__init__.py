@@ -0,0 +1,6 @@
+"""
+Benchmark suite for DailyTodo.
+
+    python -m benchmarks run --sizes 10x1,100x2 --output results.json
+    python -m benchmarks compare before.json after.json
+"""
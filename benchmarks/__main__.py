@@ -0,0 +1,36 @@
+import argparse
+import sys
+from pathlib import Path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument("--sizes", default=None, help='Datasets as "TEMPLATESxYEARS,..."')
+    run_parser.add_argument("--repeat", type=int, default=20)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", type=Path, default=None)
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("candidate", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        # Imported lazily: loading the app is only needed to run benchmarks
+        from benchmarks.run import run, parse_sizes, DEFAULT_SIZES
+
+        run(parse_sizes(args.sizes or DEFAULT_SIZES), args.repeat, args.seed, args.output)
+        return 0
+
+    from benchmarks.compare import compare
+
+    return 1 if compare(args.baseline, args.candidate, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+
+def load_medians(path: Path) -> dict[tuple, float]:
+    """Map (dataset, benchmark) to its median time in ms."""
+    report = json.loads(Path(path).read_text())
+    return {
+        (f"{r['dataset']['templates']}x{r['dataset']['years']}", r["benchmark"]): r["median_ms"]
+        for r in report["results"]
+    }
+
+
+def compare(baseline: Path, candidate: Path, threshold: float = 0.10) -> int:
+    """
+    Print median timings of two reports side by side.
+
+    :param baseline: Report of the reference commit
+    :type baseline: Path
+    :param candidate: Report of the commit under test
+    :type candidate: Path
+    :param threshold: Relative slowdown reported as a regression
+    :type threshold: float
+    :return: Number of regressions beyond the threshold
+    :rtype: int
+    """
+    before = load_medians(baseline)
+    after = load_medians(candidate)
+    regressions = 0
+
+    print(f"{'dataset':<10} {'benchmark':<36} {'before':>11} {'after':>11} {'change':>8}")
+
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key], after[key]
+        change = (new - old) / old if old else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  <- slower"
+
+        print(
+            f"{key[0]:<10} {key[1]:<36} {old:>9.3f}ms {new:>9.3f}ms {change:>+7.1%}{flag}"
+        )
+
+    for key in sorted(before.keys() ^ after.keys()):
+        print(f"{key[0]:<10} {key[1]:<36} only in {'baseline' if key in before else 'candidate'}")
+
+    return regressions
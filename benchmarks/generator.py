@@ -0,0 +1,107 @@
+import random
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database.db import create_sqlite_engine
+from app.database.init_db import init_db
+from app.database.models import TaskTemplate, DailyTask
+from app.services.daily_generator import ensure_days_exist
+from app.services.date_service import get_logical_date
+from app.services.streaks import rebuild_streaks
+
+BATCH_SIZE = 5000
+
+
+def generate_history(
+    db_path: Path,
+    templates: int,
+    years: float,
+    seed: int = 0,
+    end: date | None = None,
+) -> dict:
+    """
+    Fill a scratch SQLite database with synthetic history.
+
+    Each template gets its own completion rate, so streaks and consistency
+    vary between templates. The same seed always yields the same data.
+
+    :param db_path: Path of the scratch database (must not exist yet)
+    :type db_path: Path
+    :param templates: Number of task templates
+    :type templates: int
+    :param years: Years of daily history ending at `end`
+    :type years: float
+    :param seed: Random seed
+    :type seed: int
+    :param end: Last day of history (defaults to today's logical date)
+    :type end: date | None
+    :return: Dictionary describing the generated data
+    :rtype: dict
+    """
+    db_path = Path(db_path)
+    if db_path.exists():
+        raise FileExistsError(f"Refusing to overwrite {db_path}")
+
+    if end is None:
+        end = get_logical_date()
+
+    days = max(int(years * 365), 1)
+    start = end - timedelta(days=days - 1)
+    rng = random.Random(seed)
+
+    engine = create_sqlite_engine(db_path)
+    init_db(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    try:
+        created_at = datetime.combine(start, time())
+        db.execute(insert(TaskTemplate), [
+            {"id": i, "name": f"Task {i:05d}", "is_active": True, "created_at": created_at}
+            for i in range(1, templates + 1)
+        ])
+
+        rates = [rng.uniform(0.5, 0.99) for _ in range(templates)]
+        batch = []
+
+        for offset in range(days):
+            task_date = start + timedelta(days=offset)
+            done_at = datetime.combine(task_date, time(20, 0))
+
+            for template_id, rate in enumerate(rates, start=1):
+                completed = rng.random() < rate
+                batch.append({
+                    "task_id": template_id,
+                    "task_date": task_date,
+                    "completed": completed,
+                    "completed_at": done_at if completed else None,
+                })
+
+            if len(batch) >= BATCH_SIZE:
+                db.execute(insert(DailyTask), batch)
+                batch = []
+
+        if batch:
+            db.execute(insert(DailyTask), batch)
+
+        db.commit()
+
+        # Summaries and streaks are derived exactly as in production
+        ensure_days_exist(db, start, end)
+        rebuild_streaks(db)
+        db.commit()
+    finally:
+        db.close()
+        engine.dispose()
+
+    return {
+        "templates": templates,
+        "years": years,
+        "days": days,
+        "daily_tasks": days * templates,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "seed": seed,
+    }
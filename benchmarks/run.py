@@ -0,0 +1,184 @@
+import asyncio
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.database.dependencies import get_async_db, get_async_shard, get_shard
+from app.database.shards import Shard
+from app.main import app
+from app.services.daily_generator import ensure_day_exists, reset_day_latch
+from app.services.dashboard_service import get_dashboard_data
+from app.services.date_service import get_logical_date
+from app.services.task_service import get_today_tasks
+from benchmarks.generator import generate_history
+
+DEFAULT_SIZES = "10x1,100x1,100x3"
+
+# Profile name of the scratch databases (its own day latch and cache)
+BENCH_PROFILE = "benchmark"
+ROUTES = ("/", "/tasks/today", "/dashboard/", "/api/dashboard")
+
+
+def parse_sizes(spec: str) -> list[tuple[int, float]]:
+    """Parse "10x1,100x2.5" into [(templates, years), ...]."""
+    sizes = []
+    for item in spec.split(","):
+        templates, years = item.lower().split("x")
+        sizes.append((int(templates), float(years)))
+    return sizes
+
+
+def measure(fn, repeat: int, setup=None) -> dict:
+    """
+    Time fn() `repeat` times, calling setup() untimed before each run.
+
+    :return: Dictionary of timings in milliseconds
+    :rtype: dict
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(samples[0], 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def reset_process_state(shard: Shard):
+    """Forget in-process caches so every run starts cold."""
+    shard.cache.clear()
+    reset_day_latch()
+
+
+def bench_size(workdir: Path, templates: int, years: float, repeat: int, seed: int) -> list[dict]:
+    """Generate one dataset and run every benchmark against it."""
+    db_path = workdir / f"bench_{templates}x{years}.db"
+    dataset = generate_history(db_path, templates, years, seed=seed)
+
+    # Everything (sessions, the day opening, the read cache's version
+    # stamp) goes through a shard of the scratch file, never the user's database
+    shard = Shard(BENCH_PROFILE, db_path)
+    reset = partial(reset_process_state, shard)
+
+    results = []
+
+    def record(name: str, stats: dict):
+        results.append({"dataset": dataset, "benchmark": name, **stats})
+        print(f"  {name:<34} median {stats['median_ms']:>10.3f} ms")
+
+    db = shard.SessionLocal()
+    try:
+        # Generating a brand-new day (a fresh date every run)
+        next_day = [get_logical_date()]
+
+        def generate_new_day():
+            next_day[0] += timedelta(days=1)
+            ensure_day_exists(db, next_day[0])
+
+        record("service.ensure_day_exists.new_day", measure(generate_new_day, repeat))
+        record("service.ensure_day_exists.existing", measure(
+            lambda: ensure_day_exists(db), repeat
+        ))
+        record("service.get_dashboard_data.cold", measure(
+            lambda: get_dashboard_data(db), repeat, setup=reset
+        ))
+        record("service.get_dashboard_data.cached", measure(
+            lambda: get_dashboard_data(db), repeat
+        ))
+        record("service.get_today_tasks", measure(
+            lambda: get_today_tasks(db), repeat
+        ))
+    finally:
+        db.close()
+
+    async def override_get_async_db():
+        async with shard.AsyncSessionLocal() as session:
+            yield session
+
+    overrides = {
+        get_async_db: override_get_async_db,
+        get_async_shard: lambda: shard,
+        get_shard: lambda: shard,
+    }
+    app.dependency_overrides.update(overrides)
+    try:
+        client = TestClient(app)
+        for route in ROUTES:
+            record(f"http.GET {route}.cold", measure(
+                lambda: client.get(route), repeat, setup=reset
+            ))
+            record(f"http.GET {route}.warm", measure(
+                lambda: client.get(route), repeat
+            ))
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+        shard.engine.dispose()
+        asyncio.run(shard.async_engine.dispose())
+
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: list[tuple[int, float]], repeat: int, seed: int, output: Path | None) -> dict:
+    """
+    Run the suite for every size and optionally write the JSON report.
+
+    :return: The report
+    :rtype: dict
+    """
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="daily-todo-bench-") as tmp:
+        for templates, years in sizes:
+            print(f"Dataset: {templates} templates x {years} years")
+            report["results"].extend(
+                bench_size(Path(tmp), templates, years, repeat, seed)
+            )
+
+    reset_day_latch()
+
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2))
+        print(f"Results written to {output}")
+
+    return report
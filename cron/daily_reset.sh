@@ -1,25 +1,25 @@
 #!/bin/bash
 
-PROJECT_DIR="/home/abhijit/Use Directory/Python/DailyTodo"
-VENV_DIR="$PROJECT_DIR/venv"
+# Resolve the project from the script's own location (cron/ lives in it)
+PROJECT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+VENV_DIR="${VENV_DIR:-$PROJECT_DIR/venv}"
 PYTHON="$VENV_DIR/bin/python"
 
 LOG_FILE="$PROJECT_DIR/cron/cron.log"
 
 source "$VENV_DIR/bin/activate"
+cd "$PROJECT_DIR"
 
 echo "===========================================" >> "$LOG_FILE"
 echo "[$(date)] Running daily task generator" >> "$LOG_FILE"
 
+# Every profile's database, in parallel
 "$PYTHON" -c "
-from app.database.db import SessionLocal
-from app.services.daily_generator import ensure_day_exists
+from app.database.shards import for_each_profile
+from app.services.daily_generator import catch_up_missed_days
 
-db = SessionLocal()
-try:
-    ensure_day_exists(db)
-finally:
-    db.close()
+for profile, created in for_each_profile(catch_up_missed_days).items():
+    print(f'{profile}: {created!r}')
 " >> "$LOG_FILE" 2>&1
 
 echo "[$(date)] Daily task generator finished" >> "$LOG_FILE"
@@ -11,6 +11,10 @@ setup(
         "sqlalchemy",
         "jinja2",
         "python-dateutil",
+        "aiosqlite",
+        "greenlet",
+        "numpy",
+        "brotli",
     ],
     entry_points={
         "console_scripts": [
@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Point the app at scratch databases before anything imports it
+_scratch = tempfile.mkdtemp(prefix="daily-todo-tests-")
+os.environ["DAILY_TODO_DB_PATH"] = os.path.join(_scratch, "daily_todo.db")
+os.environ["DAILY_TODO_PROFILES_DIR"] = os.path.join(_scratch, "profiles")
+os.environ["DAILY_TODO_SCHEDULER_ENABLED"] = "false"
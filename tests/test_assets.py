@@ -0,0 +1,53 @@
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import assets as assets_module
+from app.assets import Asset, StaticAssets
+from app.main import app
+
+CSS = b"body { color: #333; }\n" * 200
+
+
+def test_asset_has_brotli_and_gzip_variants():
+    brotli = pytest.importorskip("brotli")
+
+    asset = Asset("style.css", CSS)
+
+    assert list(asset.variants) == ["br", "gzip", "identity"]
+    assert brotli.decompress(asset.variants["br"]) == CSS
+    assert asset.negotiate("gzip, deflate, br") == ("br", asset.variants["br"])
+
+
+def test_asset_without_brotli_falls_back_to_gzip(monkeypatch):
+    monkeypatch.setattr(assets_module, "brotli", None)
+
+    asset = Asset("style.css", CSS)
+
+    assert list(asset.variants) == ["gzip", "identity"]
+    assert gzip.decompress(asset.variants["gzip"]) == CSS
+    assert asset.negotiate("gzip, deflate, br")[0] == "gzip"
+
+
+def test_static_route_serves_brotli_when_accepted():
+    pytest.importorskip("brotli")
+    client = TestClient(app)
+    url = assets_module.assets.url("style.css")
+
+    br = client.get(url, headers={"Accept-Encoding": "br"})
+    plain = client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert br.headers["content-encoding"] == "br"
+    assert plain.headers["content-encoding"] == "gzip"
+    assert br.headers["etag"] == plain.headers["etag"]
+
+
+def test_static_route_without_brotli_serves_gzip(monkeypatch, tmp_path):
+    monkeypatch.setattr(assets_module, "brotli", None)
+    (tmp_path / "style.css").write_bytes(CSS)
+    monkeypatch.setattr(assets_module.assets, "_by_name", StaticAssets(tmp_path)._by_name)
+
+    response = TestClient(app).get("/static/style.css", headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
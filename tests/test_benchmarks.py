@@ -0,0 +1,24 @@
+import sqlite3
+
+from app.config import settings
+from app.services.cache import dashboard_cache
+from benchmarks.run import bench_size
+
+
+def _row_counts(path):
+    if not path.exists():
+        return None
+    with sqlite3.connect(path) as conn:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+
+
+def test_benchmark_never_touches_the_configured_database(tmp_path, monkeypatch):
+    # Make the default cache re-read its version stamp on every lookup
+    monkeypatch.setattr(dashboard_cache, "_ttl", 0)
+    before = _row_counts(settings.db_path)
+
+    results = bench_size(tmp_path, templates=3, years=0.1, repeat=1, seed=0)
+
+    assert results
+    assert _row_counts(settings.db_path) == before
@@ -0,0 +1,39 @@
+import asyncio
+
+from app import scheduler as scheduler_module
+from app.scheduler import RolloverScheduler
+
+
+def test_failed_rollover_is_retried_with_backoff(monkeypatch):
+    calls = []
+
+    def flaky_for_each_profile(work):
+        calls.append(len(calls))
+        if len(calls) < 3:
+            raise OSError("disk unavailable")
+        return {"default": None}
+
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def fast_sleep(seconds):
+        sleeps.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(scheduler_module, "for_each_profile", flaky_for_each_profile)
+    monkeypatch.setattr(scheduler_module.asyncio, "sleep", fast_sleep)
+
+    async def run():
+        rollover_scheduler = RolloverScheduler()
+        rollover_scheduler.start()
+        while len(calls) < 3 or rollover_scheduler.last_error is not None:
+            await real_sleep(0.01)
+        await rollover_scheduler.stop()
+        return rollover_scheduler
+
+    rollover_scheduler = asyncio.run(asyncio.wait_for(run(), 5))
+
+    assert len(calls) == 3
+    assert rollover_scheduler.last_error is None
+    assert sleeps[:2] == [scheduler_module.RETRY_INITIAL_SECONDS, scheduler_module.RETRY_INITIAL_SECONDS * 2]
+    assert all(seconds <= scheduler_module.MAX_SLEEP_SECONDS for seconds in sleeps)
@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database.db import create_sqlite_engine
+from app.database.init_db import init_db
+from app.database.models import DaySummary, StreakState
+from app.services.cache import VersionedCache
+from app.services.streaks import rebuild_streaks, STATE_ID
+from app.services.summary_service import apply_summary_delta
+
+TODAY = date(2026, 3, 20)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_sqlite_engine(tmp_path / "streaks.db")
+    init_db(engine)
+
+    with Session(bind=engine, info={"profile": "test", "cache": VersionedCache()}) as session:
+        yield session
+
+    engine.dispose()
+
+
+def _add_days(db, first: date, completed_by_day: list[tuple[int, int]]):
+    for offset, (total, completed) in enumerate(completed_by_day):
+        db.add(DaySummary(
+            date=first + timedelta(days=offset),
+            total_tasks=total,
+            completed_tasks=completed,
+            completion_pct=completed * 100.0 / total if total else 0.0,
+        ))
+    db.flush()
+
+
+@pytest.fixture
+def statements(db):
+    seen = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        seen.append(" ".join(statement.split()))
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    yield seen
+    event.remove(db.get_bind(), "before_cursor_execute", capture)
+
+
+def _full_scans(statements: list[str]) -> list[str]:
+    return [s for s in statements if "FROM day_summary" in s and "WHERE" not in s]
+
+
+def test_undoing_today_shrinks_the_run_without_a_rebuild(db, statements):
+    # A best run of 5 days, two imperfect days, then a 3-day run ending today
+    _add_days(db, TODAY - timedelta(days=9), [(2, 2)] * 5 + [(2, 1), (2, 0)] + [(2, 2)] * 3)
+    rebuild_streaks(db)
+    statements.clear()
+
+    apply_summary_delta(db, TODAY, completed_delta=-1)
+    state = db.get(StreakState, STATE_ID)
+
+    assert _full_scans(statements) == []
+    assert (state.current_start, state.current_end) == (TODAY - timedelta(days=2), TODAY - timedelta(days=1))
+    assert state.current_length == 2
+    assert state.best_length == 5
+
+
+def test_redoing_today_extends_the_run_again(db, statements):
+    _add_days(db, TODAY - timedelta(days=9), [(2, 2)] * 5 + [(2, 1), (2, 0)] + [(2, 2)] * 3)
+    rebuild_streaks(db)
+
+    apply_summary_delta(db, TODAY, completed_delta=-1)
+    statements.clear()
+    apply_summary_delta(db, TODAY, completed_delta=1)
+
+    state = db.get(StreakState, STATE_ID)
+
+    assert _full_scans(statements) == []
+    assert (state.current_end, state.current_length) == (TODAY, 3)
+
+
+def test_new_template_on_a_perfect_today_shrinks_the_run(db, statements):
+    _add_days(db, TODAY - timedelta(days=9), [(2, 2)] * 5 + [(2, 1), (2, 0)] + [(2, 2)] * 3)
+    rebuild_streaks(db)
+    statements.clear()
+
+    apply_summary_delta(db, TODAY, total_delta=1)
+
+    state = db.get(StreakState, STATE_ID)
+
+    assert _full_scans(statements) == []
+    assert (state.current_end, state.current_length) == (TODAY - timedelta(days=1), 2)
+
+
+def test_shrinking_the_best_run_matches_a_rebuild(db):
+    _add_days(db, TODAY - timedelta(days=2), [(2, 2)] * 3)
+    rebuild_streaks(db)
+
+    apply_summary_delta(db, TODAY, completed_delta=-1)
+
+    state = db.get(StreakState, STATE_ID)
+
+    assert (state.current_end, state.current_length, state.best_length) == (TODAY - timedelta(days=1), 2, 2)
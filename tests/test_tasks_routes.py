@@ -0,0 +1,26 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+JSON = {"content-type": "application/json"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.mark.parametrize("body", [b"[1, 2]", b'"x"', b"12", b"{bad", b'{"task_ids": "12"}'])
+def test_complete_batch_rejects_malformed_json(client, body):
+    response = client.post("/tasks/complete-batch", content=body, headers=JSON)
+
+    assert response.status_code == 400
+
+
+def test_complete_batch_accepts_an_empty_list(client):
+    response = client.post("/tasks/complete-batch", content=b'{"task_ids": []}', headers=JSON)
+
+    assert response.status_code == 200
+    assert response.json()["completed"] == 0